@@ -19,10 +19,27 @@ from typing import Callable, List, Mapping, Optional, Tuple, Union
 
 import numpy as np
 from scipy import fft
-from scipy import signal
 from scipy import special
 
 ArrayLike = Union[np.ndarray, List[float]]
+# Self-convolutions of inputs shorter than this are candidates for being
+# computed directly instead of using FFT.
+_MAX_DIRECT_CONVOLUTION_LENGTH = 64
+# Cost model for choosing between direct and FFT convolution, measured in
+# multiply-adds of direct convolution: FFT convolution of inputs of total
+# length n costs about _FFT_CONVOLUTION_FIXED_COST +
+# _FFT_CONVOLUTION_COST_FACTOR * n * log2(n).
+_FFT_CONVOLUTION_FIXED_COST = 3e5
+_FFT_CONVOLUTION_COST_FACTOR = 20
+# FFT convolutions of inputs whose lengths differ by at least this factor are
+# computed with overlap-add.
+_MIN_OVERLAP_ADD_LENGTH_RATIO = 50
+# Self-convolutions of short inputs with at most this many factors are computed
+# by repeated direct convolution instead of using FFT.
+_MAX_DIRECT_SELF_CONVOLUTION_TIMES = 4
+# Size of the first chunk of prefix sums computed when looking for the
+# truncation index of a tail.
+_TRUNCATION_SCAN_INITIAL_CHUNK_SIZE = 64
 
 
 @dataclasses.dataclass
@@ -123,27 +140,103 @@ def inverse_monotone_function(func: Callable[[float], float],
     return upper_x
 
 
+def _dictionary_to_arrays(
+    input_dictionary: Mapping[int, float]) -> Tuple[np.ndarray, np.ndarray]:
+  """Returns the keys and values of an integer-keyed dictionary as arrays."""
+  keys = np.fromiter(input_dictionary.keys(), dtype=np.int64,
+                     count=len(input_dictionary))
+  values = np.fromiter(input_dictionary.values(), dtype=np.float64,
+                       count=len(input_dictionary))
+  return keys, values
+
+
+def _scatter_to_array(keys: np.ndarray, values: np.ndarray, offset: int,
+                      length: int) -> np.ndarray:
+  """Returns an array of the given length with values at keys - offset."""
+  result_array = np.zeros(length)
+  result_array[keys - offset] = values
+  return result_array
+
+
 def dictionary_to_list(
-    input_dictionary: Mapping[int, float]) -> Tuple[int, List[float]]:
-  """Converts an integer-keyed dictionary into an list.
+    input_dictionary: Mapping[int, float]) -> Tuple[int, np.ndarray]:
+  """Converts an integer-keyed dictionary into an array.
 
   Args:
     input_dictionary: A dictionary whose keys are integers.
 
   Returns:
-    A tuple of an integer offset and a list result_list. The offset is the
+    A tuple of an integer offset and an array result_list. The offset is the
     minimum value of the input dictionary. result_list has length equal to the
     difference between the maximum and minimum values of the input dictionary.
     result_list[i] is equal to dictionary[offset + i] and is zero if offset + i
     is not a key in the input dictionary.
   """
-  offset = min(input_dictionary)
-  max_val = max(input_dictionary)
-  result_list = [input_dictionary.get(i, 0) for i in range(offset, max_val + 1)]
-  return (offset, result_list)
+  keys, values = _dictionary_to_arrays(input_dictionary)
+  offset = int(keys.min())
+  max_val = int(keys.max())
+  return (offset, _scatter_to_array(keys, values, offset, max_val - offset + 1))
+
+
+def _find_truncation_index(input_array: np.ndarray, threshold: float) -> int:
+  """Finds the length of the longest prefix whose sum is at most threshold.
+
+  Args:
+    input_array: A one-dimensional array.
+    threshold: The maximum sum of the prefix.
+
+  Returns:
+    The smallest index i such that the sum of input_array[:i + 1] is greater
+    than threshold, or len(input_array) when there is no such index.
+  """
+  # The truncated prefix is usually much shorter than the array, so the prefix
+  # sums are computed in chunks of geometrically increasing size, which costs
+  # time proportional to the returned index rather than to the array length.
+  # The entries may be negative (e.g., due to FFT round-off), hence the prefix
+  # sums need not be monotone and are scanned instead of binary searched.
+  start = 0
+  prefix_sum = 0.0
+  chunk_size = _TRUNCATION_SCAN_INITIAL_CHUNK_SIZE
+  while start < len(input_array):
+    # Prepending the running sum keeps the summation order, and thus the
+    # rounding, identical to that of a single cumsum over the whole array.
+    prefix_sums = np.cumsum(
+        np.concatenate(([prefix_sum], input_array[start:start + chunk_size])))
+    exceeds_threshold = prefix_sums[1:] > threshold
+    if np.any(exceeds_threshold):
+      return start + int(np.argmax(exceeds_threshold))
+    prefix_sum = prefix_sums[-1]
+    start += chunk_size
+    chunk_size *= 2
+  return len(input_array)
+
+
+def _find_truncation_index_and_mass(input_array: np.ndarray,
+                                    threshold: float) -> Tuple[int, float]:
+  """Finds the longest prefix whose sum is at most threshold, and its sum.
 
+  Args:
+    input_array: A one-dimensional array.
+    threshold: The maximum sum of the prefix.
 
-def list_to_dictionary(input_list: List[float],
+  Returns:
+    A pair of the index i returned by _find_truncation_index and the sum of
+    input_array[:i]. The sum is computed with math.fsum, so that it does not
+    carry the rounding error accumulated by the prefix sums used to find i.
+  """
+  index = _find_truncation_index(input_array, threshold)
+  return index, math.fsum(input_array[:index].tolist())
+
+
+def _positive_entries_to_dictionary(input_array: np.ndarray,
+                                    offset: int) -> Mapping[int, float]:
+  """Returns a dictionary mapping offset + i to input_array[i] if positive."""
+  positive_indices = np.flatnonzero(input_array > 0)
+  keys = positive_indices + offset
+  return dict(zip(keys.tolist(), input_array[positive_indices].tolist()))
+
+
+def list_to_dictionary(input_list: ArrayLike,
                        offset: int,
                        tail_mass_truncation: float = 0) -> Mapping[int, float]:
   """Converts a list into an integer-keyed dictionary, with a specified offset.
@@ -159,27 +252,55 @@ def list_to_dictionary(input_list: List[float],
     input_list[key - offset] is less than or equal to zero, it is not included
     in the dictionary.
   """
-  lower_truncation_index = 0
-  lower_truncation_mass = 0
-  while lower_truncation_index < len(input_list):
-    lower_truncation_mass += input_list[lower_truncation_index]
-    if lower_truncation_mass > tail_mass_truncation / 2:
-      break
-    lower_truncation_index += 1
-
-  upper_truncation_index = len(input_list) - 1
-  upper_truncation_mass = 0
-  while upper_truncation_index >= 0:
-    upper_truncation_mass += input_list[upper_truncation_index]
-    if upper_truncation_mass > tail_mass_truncation / 2:
-      break
-    upper_truncation_index -= 1
-
-  result_dictionary = {}
-  for i in range(lower_truncation_index, upper_truncation_index + 1):
-    if input_list[i] > 0:
-      result_dictionary[i + offset] = input_list[i]
-  return result_dictionary
+  input_list = np.asarray(input_list, dtype=np.float64)
+  lower_truncation_index = _find_truncation_index(input_list,
+                                                  tail_mass_truncation / 2)
+  upper_truncation_index = len(input_list) - 1 - _find_truncation_index(
+      np.flip(input_list), tail_mass_truncation / 2)
+
+  return _positive_entries_to_dictionary(
+      input_list[lower_truncation_index:upper_truncation_index + 1],
+      lower_truncation_index + offset)
+
+
+def _use_direct_convolution(len1: int, len2: int) -> bool:
+  """Returns whether direct convolution is expected to be faster than FFT.
+
+  np.convolve is a tight compiled loop with cost proportional to len1 * len2,
+  while FFT convolution has a sizable fixed overhead. Hence direct convolution
+  is faster when one of the inputs is short, e.g., up to a few hundred entries
+  when the other one has a few thousand.
+
+  Args:
+    len1: the length of the first input.
+    len2: the length of the second input.
+
+  Returns:
+    True if direct convolution should be used, False if FFT should be used.
+  """
+  total_len = len1 + len2
+  return len1 * len2 <= (
+      _FFT_CONVOLUTION_FIXED_COST +
+      _FFT_CONVOLUTION_COST_FACTOR * total_len * math.log2(total_len))
+
+
+def _use_overlap_add_convolution(len1: int, len2: int) -> bool:
+  """Returns whether overlap-add is expected to be faster than a single FFT.
+
+  Overlap-add FFT convolution (scipy.signal.oaconvolve) splits the longer input
+  into blocks of a few times the length of the shorter one, so that all FFTs
+  are short. This is faster than one FFT of the full output length, e.g., when
+  a long PMF is composed with a much shorter one, but not when the inputs have
+  comparable lengths.
+
+  Args:
+    len1: the length of the first input.
+    len2: the length of the second input.
+
+  Returns:
+    True if overlap-add should be used for FFT convolution of the inputs.
+  """
+  return max(len1, len2) >= _MIN_OVERLAP_ADD_LENGTH_RATIO * min(len1, len2)
 
 
 def convolve_dictionary(dictionary1: Mapping[int, float],
@@ -198,13 +319,25 @@ def convolve_dictionary(dictionary1: Mapping[int, float],
     all key1, key2 such that key1 + key2 = key, of dictionary1[key1] times
     dictionary2[key2]
   """
-
-  # Convert the dictionaries to lists.
-  min1, list1 = dictionary_to_list(dictionary1)
-  min2, list2 = dictionary_to_list(dictionary2)
-
-  # Compute the convolution of the two lists.
-  result_list = signal.fftconvolve(list1, list2)
+  keys1, values1 = _dictionary_to_arrays(dictionary1)
+  keys2, values2 = _dictionary_to_arrays(dictionary2)
+  min1, min2 = int(keys1.min()), int(keys2.min())
+  len1 = int(keys1.max()) - min1 + 1
+  len2 = int(keys2.max()) - min2 + 1
+
+  # Compute the convolution of the two dictionaries as lists.
+  if _use_direct_convolution(len1, len2):
+    result_list = np.convolve(
+        _scatter_to_array(keys1, values1, min1, len1),
+        _scatter_to_array(keys2, values2, min2, len2))
+  else:
+    # The dictionaries are scattered directly into zero-padded buffers of the
+    # FFT length, which is the smallest 5-smooth length that fits the output.
+    output_len = len1 + len2 - 1
+    fast_len = fft.next_fast_len(output_len, real=True)
+    spectrum = (fft.rfft(_scatter_to_array(keys1, values1, min1, fast_len)) *
+                fft.rfft(_scatter_to_array(keys2, values2, min2, fast_len)))
+    result_list = fft.irfft(spectrum, fast_len)[:output_len]
 
   # Convert the list back to a dictionary and return
   return list_to_dictionary(
@@ -260,9 +393,63 @@ def compute_self_convolve_bounds(
   return lower_bound, upper_bound
 
 
+def _power_by_squaring(spectrum: np.ndarray, num_times: int,
+                       overwrite_input: bool = False) -> np.ndarray:
+  """Computes the element-wise num_times-th power of a spectrum.
+
+  The power is computed by repeated squaring, so that only O(log(num_times))
+  complex multiplications are performed for each element, instead of evaluating
+  the complex power through exp(num_times * log(z)). The multiplications are
+  done in place, so at most two arrays of the size of spectrum are used.
+
+  Args:
+    spectrum: The array to be raised to a power.
+    num_times: The (positive) exponent.
+    overwrite_input: whether spectrum may be overwritten, which saves a copy.
+
+  Returns:
+    The array whose i-th entry is spectrum[i]**num_times.
+  """
+  power = spectrum if overwrite_input else spectrum.copy()
+  result = None
+  while True:
+    if num_times & 1:
+      if result is not None:
+        np.multiply(result, power, out=result)
+      elif num_times == 1:
+        # No further squaring of power is needed, so it can be returned as is.
+        return power
+      else:
+        result = power.copy()
+    num_times >>= 1
+    if not num_times:
+      return result
+    np.multiply(power, power, out=power)
+
+
+def _extract_circular_window(circular_output: np.ndarray, start: int,
+                             length: int) -> np.ndarray:
+  """Extracts entries start, ..., start + length - 1 of a circular array.
+
+  Args:
+    circular_output: an array whose indices are taken modulo its length.
+    start: the (possibly out of range) index of the first entry to extract.
+    length: the number of entries to extract, at most len(circular_output).
+
+  Returns:
+    The extracted entries, copying only length entries when wrapping around.
+  """
+  start %= len(circular_output)
+  if start + length <= len(circular_output):
+    return circular_output[start:start + length]
+  return np.concatenate(
+      (circular_output[start:],
+       circular_output[:start + length - len(circular_output)]))
+
+
 def self_convolve(input_list: ArrayLike,
                   num_times: int,
-                  tail_mass_truncation: float = 0) -> Tuple[int, List[float]]:
+                  tail_mass_truncation: float = 0) -> Tuple[int, np.ndarray]:
   """Computes a convolution of the input list with itself num_times times.
 
   Args:
@@ -280,19 +467,53 @@ def self_convolve(input_list: ArrayLike,
   truncation_lower_bound, truncation_upper_bound = compute_self_convolve_bounds(
       input_list, num_times, tail_mass_truncation)
 
-  # Use FFT to compute the convolution
-  output_len = truncation_upper_bound - truncation_lower_bound + 1
-  fast_len = fft.next_fast_len(max(output_len, len(input_list)))
-  truncated_convolution_output = np.real(
-      fft.ifft(fft.fft(input_list, fast_len)**num_times))
+  input_list = np.asarray(input_list, dtype=np.float64)
 
-  # Discrete Fourier Transform wraps around modulo fast_len. Extract the output
-  # values in the range of interest.
-  output_list = np.roll(
-      truncated_convolution_output, -truncation_lower_bound
-  )[:output_len]
+  if num_times == 1:
+    # No convolution is needed; only the truncation is applied. The output is
+    # copied, so that callers may modify it without changing input_list.
+    output_list = input_list[
+        truncation_lower_bound:truncation_upper_bound + 1].copy()
+    return truncation_lower_bound, output_list
 
-  return truncation_lower_bound, output_list
+  output_len = truncation_upper_bound - truncation_lower_bound + 1
+  # Only the output window needs to be resolved, so the FFT length is chosen
+  # based on output_len alone.
+  fast_len = fft.next_fast_len(output_len, real=True)
+
+  if (num_times <= _MAX_DIRECT_SELF_CONVOLUTION_TIMES and
+      len(input_list) < _MAX_DIRECT_CONVOLUTION_LENGTH):
+    # For a few factors of a short input, repeated direct convolution is faster
+    # than FFT. Its output is folded modulo fast_len, so that the result is the
+    # same circular convolution that the FFT below computes.
+    convolution_output = input_list
+    for _ in range(num_times - 1):
+      convolution_output = np.convolve(convolution_output, input_list)
+    num_rows = -(-len(convolution_output) // fast_len)
+    folded_output = np.zeros(num_rows * fast_len)
+    folded_output[:len(convolution_output)] = convolution_output
+    truncated_convolution_output = folded_output.reshape(
+        num_rows, fast_len).sum(axis=0)
+    return truncation_lower_bound, _extract_circular_window(
+        truncated_convolution_output, truncation_lower_bound, output_len)
+
+  # Use FFT to compute the convolution. Since the input is real, its spectrum is
+  # Hermitian symmetric and real FFT only needs to handle half of it.
+  if len(input_list) > fast_len:
+    # The convolution is circular modulo fast_len, so an input longer than
+    # fast_len can be folded modulo fast_len without changing the result.
+    num_rows = -(-len(input_list) // fast_len)
+    folded_input = np.zeros(num_rows * fast_len)
+    folded_input[:len(input_list)] = input_list
+    input_list = folded_input.reshape(num_rows, fast_len).sum(axis=0)
+  truncated_convolution_output = fft.irfft(
+      _power_by_squaring(
+          fft.rfft(input_list, fast_len), num_times, overwrite_input=True),
+      fast_len)
+
+  # Discrete Fourier Transform wraps around modulo fast_len.
+  return truncation_lower_bound, _extract_circular_window(
+      truncated_convolution_output, truncation_lower_bound, output_len)
 
 
 def self_convolve_dictionary(
@@ -317,8 +538,10 @@ def self_convolve_dictionary(
   min_val, input_list = dictionary_to_list(input_dictionary)
   min_val_convolution, output_list = self_convolve(
       input_list, num_times, tail_mass_truncation=tail_mass_truncation)
-  return list_to_dictionary(output_list,
-                            min_val * num_times + min_val_convolution)
+  # The output of self_convolve is already truncated to the range given by
+  # compute_self_convolve_bounds, so there is no need to scan it for tails.
+  return _positive_entries_to_dictionary(
+      output_list, min_val * num_times + min_val_convolution)
 
 
 def _log_add(a: float, b: float) -> float:
@@ -18,6 +18,7 @@ import unittest
 from unittest import mock
 
 from absl.testing import parameterized
+import numpy as np
 
 from dp_accounting.pld import common
 from dp_accounting.pld import test_util
@@ -107,6 +108,16 @@ class CommonTest(parameterized.TestCase):
           'expected_x': 5,
           'increasing': False,
           'discrete': True,
+      }, {
+          'testcase_name': 'discrete_initial_guess',
+          'func': (lambda x: -x),
+          'value': -100.5,
+          'lower_x': 0,
+          'upper_x': 1000,
+          'initial_guess_x': 3,
+          'expected_x': 101,
+          'increasing': False,
+          'discrete': True,
       })
   def test_inverse_monotone_function(self,
                                      func,
@@ -169,6 +180,42 @@ class DictListConversionTest(parameterized.TestCase):
         input_list, offset, tail_mass_truncation=tail_mass_truncation)
     test_util.assert_dictionary_almost_equal(self, expected_result, result)
 
+  def test_list_to_dict_truncation_long_tails(self):
+    # The truncated tails span several chunks of the prefix sum scan.
+    input_list = [0.001] * 300 + [0.4] + [0.001] * 300
+    result = common.list_to_dictionary(
+        input_list, 1, tail_mass_truncation=0.4001)
+    expected_result = {i + 1: 0.001 for i in range(200, 401)}
+    expected_result[301] = 0.4
+    test_util.assert_dictionary_almost_equal(self, expected_result, result)
+
+  @parameterized.parameters((0.0505, 50, 0.05), (0.2005, 200, 0.2),
+                            (10, 601, 1.0))
+  def test_find_truncation_index_and_mass(self, threshold, expected_index,
+                                          expected_mass):
+    input_array = np.array([0.001] * 300 + [0.4] + [0.001] * 300)
+    index, mass = common._find_truncation_index_and_mass(input_array,
+                                                         threshold)
+    self.assertEqual(expected_index, index)
+    self.assertAlmostEqual(expected_mass, mass)
+
+  def test_find_truncation_index_and_mass_is_exact(self):
+    # Naive prefix sums lose every 1e-17 entry added after the first entry.
+    input_array = np.array([1.0] + [1e-17] * 10000)
+    index, mass = common._find_truncation_index_and_mass(input_array, 2)
+    self.assertEqual(10001, index)
+    self.assertEqual(1 + 1e-13, mass)
+
+  @parameterized.parameters(({3: 0.5, 5: 0.2}, 3, [0.5, 0, 0.2]),
+                            ({-2: 0.1, 1: 0.3, -1: 0.6}, -2,
+                             [0.1, 0.6, 0, 0.3]),
+                            ({4: 1}, 4, [1]))
+  def test_dict_to_list(self, input_dictionary, expected_offset,
+                        expected_list):
+    offset, result_list = common.dictionary_to_list(input_dictionary)
+    self.assertEqual(expected_offset, offset)
+    self.assertSequenceAlmostEqual(expected_list, result_list)
+
 
 class ConvolveTest(parameterized.TestCase):
 
@@ -186,6 +233,18 @@ class ConvolveTest(parameterized.TestCase):
     result = common.convolve_dictionary(dictionary1, dictionary2, 0.57)
     test_util.assert_dictionary_almost_equal(self, expected_result, result)
 
+  @parameterized.parameters((5, 80), (70, 80))
+  def test_convolve_dictionary_long(self, length1, length2):
+    dictionary1 = {i - 3: 1 / (i + 1) for i in range(length1)}
+    dictionary2 = {2 * i: 1 / (i + 2) for i in range(length2)}
+    expected_result = {}
+    for key1, value1 in dictionary1.items():
+      for key2, value2 in dictionary2.items():
+        expected_result[key1 + key2] = (
+            expected_result.get(key1 + key2, 0) + value1 * value2)
+    result = common.convolve_dictionary(dictionary1, dictionary2)
+    test_util.assert_dictionary_almost_equal(self, expected_result, result)
+
   def test_self_convolve_dictionary(self):
     inp_dictionary = {1: 2, 3: 5, 4: 6}
     expected_result = {
@@ -203,12 +262,60 @@ class ConvolveTest(parameterized.TestCase):
     test_util.assert_dictionary_almost_equal(self, expected_result, result)
 
   @parameterized.parameters(([3, 5, 7], 2, [9, 30, 67, 70, 49]),
-                            ([1, 3, 4], 3, [1, 9, 39, 99, 156, 144, 64]))
+                            ([1, 3, 4], 3, [1, 9, 39, 99, 156, 144, 64]),
+                            ([1, 2], 5, [1, 10, 40, 80, 80, 32]),
+                            ([2, 0, 7], 1, [2, 0, 7]))
   def test_self_convolve_basic(self, input_list, num_times, expected_result):
     min_val, result_list = common.self_convolve(input_list, num_times)
     self.assertEqual(0, min_val)
     self.assertSequenceAlmostEqual(expected_result, result_list)
 
+  def test_self_convolve_once_copies_input(self):
+    input_array = np.array([0.2, 0.5, 0.3])
+    _, result_list = common.self_convolve(input_array, 1)
+    result_list[0] += 1
+    self.assertSequenceAlmostEqual([0.2, 0.5, 0.3], input_array)
+
+  @parameterized.product(num_times=(1, 2, 3, 4, 7, 8, 13),
+                         overwrite_input=(False, True))
+  def test_power_by_squaring(self, num_times, overwrite_input):
+    spectrum = np.array([1.0, 0.5 + 0.5j, -0.3j, 0.9 - 0.1j])
+    original_spectrum = spectrum.copy()
+    result = common._power_by_squaring(spectrum, num_times, overwrite_input)
+    np.testing.assert_allclose(original_spectrum**num_times, result,
+                               rtol=1e-14)
+    if not overwrite_input:
+      np.testing.assert_array_equal(original_spectrum, spectrum)
+
+  @parameterized.parameters((1, 10**6, True), (64, 64, True),
+                            (200, 5000, True), (1000, 1000, False),
+                            (500, 5000, False))
+  def test_use_direct_convolution(self, len1, len2, expected_result):
+    self.assertEqual(expected_result,
+                     common._use_direct_convolution(len1, len2))
+    self.assertEqual(expected_result,
+                     common._use_direct_convolution(len2, len1))
+
+  @parameterized.parameters((100, 10**5, True), (1000, 50000, True),
+                            (5000, 10**5, False), (1000, 1000, False))
+  def test_use_overlap_add_convolution(self, len1, len2, expected_result):
+    self.assertEqual(expected_result,
+                     common._use_overlap_add_convolution(len1, len2))
+    self.assertEqual(expected_result,
+                     common._use_overlap_add_convolution(len2, len1))
+
+  @parameterized.parameters(([0.3, 0.5, 0.2], 2, 0), ([0.1, 0.4, 0.5], 3, 0.5),
+                            ([0.2, 0.6, 0.2], 4, 0.7))
+  def test_self_convolve_direct_matches_fft(self, input_list, num_times,
+                                            tail_mass_truncation):
+    min_val, result_list = common.self_convolve(
+        input_list, num_times, tail_mass_truncation=tail_mass_truncation)
+    with mock.patch.object(common, '_MAX_DIRECT_SELF_CONVOLUTION_TIMES', 0):
+      expected_min_val, expected_result_list = common.self_convolve(
+          input_list, num_times, tail_mass_truncation=tail_mass_truncation)
+    self.assertEqual(expected_min_val, min_val)
+    self.assertSequenceAlmostEqual(expected_result_list, result_list)
+
   @parameterized.parameters(([0.1, 0.4, 0.5], 3, [-1], 0.5, 2, 6),
                             ([0.2, 0.6, 0.2], 3, [1], 0.7, 0, 5))
   def test_compute_self_convolve_bounds(self, input_list, num_times, orders,
@@ -242,6 +349,22 @@ class ConvolveTest(parameterized.TestCase):
     self.assertEqual(min_val, 6)
     self.assertSequenceAlmostEqual([1], result_list)
 
+  @mock.patch.object(
+      common, 'compute_self_convolve_bounds', return_value=(2, 4)
+  )
+  def test_self_convolve_input_longer_than_output(self, _):
+    # The input is folded modulo the FFT length, which gives the same result
+    # as the circular convolution of the unfolded input.
+    input_list = [1, 2, 3, 4, 5, 6, 7]
+    full_convolution = np.convolve(input_list, input_list)
+    folded_convolution = np.zeros(3)
+    for i, value in enumerate(full_convolution):
+      folded_convolution[i % 3] += value
+    min_val, result_list = common.self_convolve(input_list, 2)
+    self.assertEqual(2, min_val)
+    self.assertSequenceAlmostEqual(
+        folded_convolution[[2, 0, 1]], result_list)
+
   @parameterized.parameters(
       (5, 7, 3, 8.60998489),
       (0.5, 3, 0.1, 2.31676098),
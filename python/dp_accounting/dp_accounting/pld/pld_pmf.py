@@ -20,13 +20,13 @@ supplementary material below for more details:
 """
 
 import abc
-import itertools
 import math
 import numbers
-from typing import Iterable, List, Mapping, Sequence, Tuple, Union
+from typing import List, Mapping, Sequence, Tuple, Union
 
 import numpy as np
 import numpy.typing
+from scipy import fft
 from scipy import signal
 
 from dp_accounting.pld import common
@@ -51,12 +51,16 @@ def _get_delta_for_epsilon(infinity_mass: float,
     The epsilon-hockey stick divergence.
   """
   # delta is inf_mass + sum_{loss} max(0, 1 - exp(epsilon - loss)) * prob
+  # The sum is computed with np.sum, which uses pairwise summation and thus
+  # accumulates less rounding error than sequential summation on large PMFs.
+  # Since losses are sorted, the losses greater than epsilon form a suffix,
+  # which is found by binary search.
   losses = np.asarray(losses)
   probs = np.asarray(probs)
-  indices = losses > epsilon
+  start = np.searchsorted(losses, epsilon, side='right')
   return (
       infinity_mass +
-      np.dot(-np.expm1(epsilon - losses[indices]), probs[indices])
+      np.sum(-np.expm1(epsilon - losses[start:]) * probs[start:])
   )
 
 
@@ -91,32 +95,29 @@ def _get_delta_for_epsilon_vectorized(infinity_mass: float,
   # inf_mass + sum(prob_j, loss_j >= epsilon_i) -
   # exp(eps)*sum(prob_j/exp(loss_j), loss_j >= epsilon_i).
   #
-  # Denote sums in the last formula as mu_upper_mass, mu_lower_mass. We can
-  # compute them gradually, which makes computation efficiently for multiple
-  # epsilons.
-  deltas = np.zeros_like(epsilons, dtype=np.float64)
-  mu_upper_mass, mu_lower_mass = infinity_mass, 0
-  i = len(probs) - 1
-  j = len(epsilons) - 1
-
-  while j >= 0:
-    if np.isposinf(epsilons[j]):
-      deltas[j] = infinity_mass
-      j -= 1
-    elif i < 0 or losses[i] <= epsilons[j]:
-      deltas[j] = mu_upper_mass - np.exp(epsilons[j]) * mu_lower_mass
-      j -= 1
-    else:
-      mu_upper_mass += probs[i]
-      mu_lower_mass += probs[i] * np.exp(-losses[i])
-      i -= 1
-
+  # Denote sums in the last formula as mu_upper_mass, mu_lower_mass. They are
+  # computed for all suffixes of the losses at once, with a single vectorized
+  # exp of the losses, and each epsilon picks its suffix by binary search.
+  losses = np.asarray(losses, dtype=np.float64)
+  probs = np.asarray(probs, dtype=np.float64)
+  epsilons = np.asarray(epsilons, dtype=np.float64)
+  # mu_upper_mass[k] and mu_lower_mass[k] are the sums over the k largest
+  # losses, accumulated from the largest loss downwards.
+  with np.errstate(over='ignore', invalid='ignore'):
+    mu_upper_mass = np.cumsum(np.concatenate(([infinity_mass], probs[::-1])))
+    mu_lower_mass = np.cumsum(
+        np.concatenate(([0.], (probs * np.exp(-losses))[::-1])))
+    num_larger_losses = len(losses) - np.searchsorted(
+        losses, epsilons, side='right')
+    deltas = (mu_upper_mass[num_larger_losses] -
+              np.exp(epsilons) * mu_lower_mass[num_larger_losses])
+  deltas[np.isposinf(epsilons)] = infinity_mass
   return deltas
 
 
 def _get_epsilon_for_delta(infinity_mass: float,
-                           reversed_losses: Iterable[float],
-                           probs: Iterable[float], delta: float) -> float:
+                           reversed_losses: ArrayLike,
+                           probs: ArrayLike, delta: float) -> float:
   """Computes epsilon for which hockey stick divergence is at most delta.
 
   Args:
@@ -132,25 +133,39 @@ def _get_epsilon_for_delta(infinity_mass: float,
   if infinity_mass > delta:
     return math.inf
 
-  mass_upper, mass_lower = infinity_mass, 0
-
-  for loss, prob in zip(reversed_losses, probs):
-    if (mass_upper > delta and mass_lower > 0 and math.log(
-        (mass_upper - delta) / mass_lower) >= loss):
-      # Epsilon is greater than or equal to loss.
-      break
-
-    mass_upper += prob
-    mass_lower += math.exp(-loss) * prob
-
-    if mass_upper >= delta and mass_lower == 0:
-      # This only occurs when loss is very large, which results in exp(-loss)
-      # being treated as zero.
-      return max(0, loss)
-
-  if mass_upper <= mass_lower + delta:
+  reversed_losses = np.asarray(reversed_losses, dtype=np.float64)
+  probs = np.asarray(probs, dtype=np.float64)
+
+  # mass_upper[k] and mass_lower[k] are the sums of probs[i] and of
+  # exp(-reversed_losses[i]) * probs[i] over i < k, with infinity_mass added to
+  # the former. Entries past the returned epsilon are computed but not used, so
+  # floating point errors in them are ignored.
+  with np.errstate(over='ignore', divide='ignore', invalid='ignore'):
+    mass_upper = np.cumsum(np.concatenate(([infinity_mass], probs)))
+    mass_lower = np.cumsum(
+        np.concatenate(([0.], np.exp(-reversed_losses) * probs)))
+
+    # Epsilon is greater than or equal to the k-th loss when the masses of the
+    # larger losses already determine epsilon to be at least that loss.
+    epsilon_at_least_loss = (
+        (mass_upper[:-1] > delta) & (mass_lower[:-1] > 0) &
+        (np.log((mass_upper[:-1] - delta) / mass_lower[:-1]) >=
+         reversed_losses))
+  # When the losses are very large, exp(-loss) is treated as zero and mass_lower
+  # stays zero although mass_upper reaches delta.
+  lower_mass_vanishes = (mass_upper[1:] >= delta) & (mass_lower[1:] == 0)
+
+  num_losses = len(reversed_losses)
+  stop_index = (int(np.argmax(epsilon_at_least_loss))
+                if np.any(epsilon_at_least_loss) else num_losses)
+  if np.any(lower_mass_vanishes[:stop_index]):
+    return max(0, float(
+        reversed_losses[np.argmax(lower_mass_vanishes[:stop_index])]))
+
+  if mass_upper[stop_index] <= mass_lower[stop_index] + delta:
     return 0
-  return math.log((mass_upper - delta) / mass_lower)
+  return math.log(
+      (mass_upper[stop_index] - delta) / mass_lower[stop_index])
 
 
 def _truncate_tails(probs: ArrayLike, tail_mass_truncation: float,
@@ -176,26 +191,24 @@ def _truncate_tails(probs: ArrayLike, tail_mass_truncation: float,
   if tail_mass_truncation == 0:
     return 0, probs, 0
 
-  def _find_prefix_to_truncate(arr: np.ndarray, threshold: float) -> int:
-    # Find the max size of array prefix, with the sum of elements less than
-    # threshold.
-    s = 0
-    for i, val in enumerate(arr):
-      s += val
-      if s > threshold:
-        return i
-    return len(arr)
-
-  left_idx = _find_prefix_to_truncate(probs, tail_mass_truncation / 2)
-  right_idx = len(probs) - _find_prefix_to_truncate(
+  # Find the max size of the prefix and of the suffix, with the sum of elements
+  # at most tail_mass_truncation / 2, using vectorized prefix sums.
+  probs = np.asarray(probs)
+  # The truncated masses are summed exactly, since the mass truncated on the
+  # right goes to infinity and directly bounds delta.
+  # pylint: disable=protected-access
+  left_idx, left_mass = common._find_truncation_index_and_mass(
+      probs, tail_mass_truncation / 2)
+  right_len, right_mass = common._find_truncation_index_and_mass(
       np.flip(probs), tail_mass_truncation / 2)
+  # pylint: enable=protected-access
+  right_idx = len(probs) - right_len
   # Be sure that left_idx < right_idx. left_idx >= right_idx might be when
   # tail_mass_truncation is too large or if probs has too small mass
   # (i.e. if a few truncations were operated on it already).
-  right_idx = max(right_idx, left_idx + 1)
-
-  left_mass = np.sum(probs[:left_idx])
-  right_mass = np.sum(probs[right_idx:])
+  if right_idx <= left_idx:
+    right_idx = left_idx + 1
+    right_mass = math.fsum(probs[right_idx:].tolist())
 
   truncated_probs = probs[left_idx:right_idx]
   if pessimistic_estimate:
@@ -208,6 +221,83 @@ def _truncate_tails(probs: ArrayLike, tail_mass_truncation: float,
   return left_idx, truncated_probs, 0
 
 
+def _coarsen_rounded_losses(rounded_losses: np.ndarray, factor: int,
+                            pessimistic_estimate: bool) -> np.ndarray:
+  """Maps rounded losses onto a grid which is factor times coarser.
+
+  Args:
+    rounded_losses: integer losses, as multiples of the current discretization.
+    factor: the ratio of the new discretization to the current one.
+    pessimistic_estimate: if true, losses are rounded up to the coarser grid,
+      otherwise they are rounded down.
+
+  Returns:
+    Integer losses, as multiples of factor times the current discretization.
+  """
+  if pessimistic_estimate:
+    return -np.floor_divide(-rounded_losses, factor)
+  return np.floor_divide(rounded_losses, factor)
+
+
+def _compose_infinity_masses(infinity_mass1: float,
+                             infinity_mass2: float) -> float:
+  """Computes the infinity mass of the composition of two PMFs.
+
+  The infinity mass of the composition is 1 - (1 - infinity_mass1) *
+  (1 - infinity_mass2), which is computed through log1p and expm1 so that it is
+  accurate both for tiny masses and for masses close to 1. A mass which exceeds
+  1 due to rounding, e.g., after adding truncated tail mass, is treated as 1.
+
+  Args:
+    infinity_mass1: the infinity mass of the first PMF.
+    infinity_mass2: the infinity mass of the second PMF.
+
+  Returns:
+    The infinity mass of the composed PMF.
+  """
+  if infinity_mass1 >= 1 or infinity_mass2 >= 1:
+    return 1.0
+  return -math.expm1(math.log1p(-infinity_mass1) + math.log1p(-infinity_mass2))
+
+
+def _self_compose_infinity_mass(infinity_mass: float, num_times: int) -> float:
+  """Computes the infinity mass of a PMF composed num_times with itself.
+
+  Args:
+    infinity_mass: the infinity mass of the PMF.
+    num_times: the number of times the PMF is composed with itself.
+
+  Returns:
+    1 - (1 - infinity_mass)**num_times, computed in a numerically stable way.
+  """
+  if infinity_mass >= 1:
+    return 1.0
+  return -math.expm1(num_times * math.log1p(-infinity_mass))
+
+
+def _trim_zero_tails(lower_loss: int,
+                     probs: np.ndarray) -> Tuple[int, np.ndarray]:
+  """Removes the leading and trailing zeros of a dense probability array.
+
+  Zero runs at the ends of probs do not change the distribution, but they
+  increase the FFT length of every subsequent composition.
+
+  Args:
+    lower_loss: the rounded loss of the first entry of probs.
+    probs: the dense probability array.
+
+  Returns:
+    A pair of the rounded loss of the first nonzero entry of probs and the
+    slice of probs between its first and last nonzero entries. If all entries
+    are zero, lower_loss and probs are returned unchanged.
+  """
+  nonzero_indices = np.flatnonzero(probs)
+  if not nonzero_indices.size:
+    return lower_loss, probs
+  start, end = nonzero_indices[0], nonzero_indices[-1] + 1
+  return lower_loss + int(start), probs[start:end]
+
+
 class PLDPmf(abc.ABC):
   """Base class for probability mass functions for privacy loss distributions.
 
@@ -235,6 +325,9 @@ class PLDPmf(abc.ABC):
   integral [f_{mu_upper}(o) - e^{epsilon} * f_{mu_lower}(o)]_+ do.
   """
 
+  __slots__ = ('_discretization', '_infinity_mass', '_pessimistic_estimate',
+               '__weakref__')
+
   def __init__(self, discretization: float, infinity_mass: float,
                pessimistic_estimate: bool):
     self._discretization = discretization
@@ -277,6 +370,27 @@ class PLDPmf(abc.ABC):
       A privacy loss distribution PMF which is the result of the composition.
     """
 
+  @abc.abstractmethod
+  def coarsen(self, factor: int) -> 'PLDPmf':
+    """Computes PMF on a grid which is factor times coarser.
+
+    Each loss is rounded to a multiple of factor * discretization, up if
+    pessimistic_estimate is true and down otherwise, so the resulting PMF
+    preserves the direction of the estimate. Coarsening a PMF whose support
+    has grown, e.g. after many compositions, trades accuracy for smaller
+    subsequent compositions.
+
+    Args:
+      factor: the ratio of the new discretization to the current one. Must be a
+        positive integer.
+
+    Returns:
+      A PMF with discretization factor * discretization.
+
+    Raises:
+      ValueError: If factor is not a positive integer.
+    """
+
   @abc.abstractmethod
   def get_delta_for_epsilon(
       self, epsilon: Union[float, Sequence[float]]) -> Union[float, np.ndarray]:
@@ -311,6 +425,11 @@ class PLDPmf(abc.ABC):
                        f'{other._pessimistic_estimate}.')  # pylint: disable=protected-access
     # pylint: enable=protected-access
 
+  def _validate_coarsening_factor(self, factor: int):
+    """Checks whether 'factor' is a valid argument of coarsen."""
+    if not isinstance(factor, numbers.Integral) or factor < 1:
+      raise ValueError(f'factor should be a positive integer, factor={factor}')
+
 
 class DensePLDPmf(PLDPmf):
   """Class for dense probability mass function.
@@ -320,6 +439,8 @@ class DensePLDPmf(PLDPmf):
   lower_loss * discretization.
   """
 
+  __slots__ = ('_lower_loss', '_probs')
+
   def __init__(self, discretization: float, lower_loss: int, probs: np.ndarray,
                infinity_mass: float, pessimistic_estimate: bool):
     super().__init__(discretization, infinity_mass, pessimistic_estimate)
@@ -338,9 +459,17 @@ class DensePLDPmf(PLDPmf):
 
     # pylint: disable=protected-access
     lower_loss = self._lower_loss + other._lower_loss
-    probs = signal.fftconvolve(self._probs, other._probs)
-    infinity_mass = (self._infinity_mass + other._infinity_mass
-                     - self._infinity_mass * other._infinity_mass)
+    if common._use_direct_convolution(self.size, other.size):
+      probs = np.convolve(self._probs, other._probs)
+    else:
+      if common._use_overlap_add_convolution(self.size, other.size):
+        probs = signal.oaconvolve(self._probs, other._probs)
+      else:
+        probs = signal.fftconvolve(self._probs, other._probs)
+      # Clamp negative round-off errors of FFT.
+      np.maximum(probs, 0, out=probs)
+    infinity_mass = _compose_infinity_masses(self._infinity_mass,
+                                             other._infinity_mass)
     offset, probs, right_tail = _truncate_tails(probs, tail_mass_truncation,
                                                 self._pessimistic_estimate)
     # pylint: enable=protected-access
@@ -357,15 +486,24 @@ class DensePLDPmf(PLDPmf):
     truncation_lower_bound, probs = common.self_convolve(
         self._probs, num_times, tail_mass_truncation)
     lower_loss += truncation_lower_bound
-    probs = np.array(probs)
     # infinity mass after composition is given as
     # tail_mass_truncation + 1 - (1 - infinity_mass)**num_times
-    # Below we use a numerically stable approach to compute the second term.
-    inf_prob = (tail_mass_truncation
-                - math.expm1(num_times * math.log1p(- self._infinity_mass)))
+    inf_prob = tail_mass_truncation + _self_compose_infinity_mass(
+        self._infinity_mass, num_times)
     return DensePLDPmf(self._discretization, lower_loss, probs,
                        inf_prob, self._pessimistic_estimate)
 
+  def coarsen(self, factor: int) -> 'DensePLDPmf':
+    """See base class."""
+    self._validate_coarsening_factor(factor)
+    rounded_losses = _coarsen_rounded_losses(
+        np.arange(self.size) + self._lower_loss, factor,
+        self._pessimistic_estimate)
+    lower_loss = int(rounded_losses[0])
+    probs = np.bincount(rounded_losses - lower_loss, weights=self._probs)
+    return DensePLDPmf(self._discretization * factor, lower_loss, probs,
+                       self._infinity_mass, self._pessimistic_estimate)
+
   def get_delta_for_epsilon(
       self, epsilon: Union[float, Sequence[float]]) -> Union[float, np.ndarray]:
     """Computes the epsilon-hockey stick divergence."""
@@ -379,9 +517,8 @@ class DensePLDPmf(PLDPmf):
 
   def get_epsilon_for_delta(self, delta: float) -> float:
     """Computes epsilon for which hockey stick divergence is at most delta."""
-    upper_loss = (self._lower_loss + len(self._probs) -
-                  1) * self._discretization
-    reversed_losses = itertools.count(upper_loss, -self._discretization)
+    reversed_losses = np.flip(
+        np.arange(self.size) + self._lower_loss) * self._discretization
 
     return _get_epsilon_for_delta(self._infinity_mass, reversed_losses,
                                   np.flip(self._probs), delta)
@@ -398,10 +535,11 @@ class DensePLDPmf(PLDPmf):
     self_loss = lambda index: (index + self._lower_loss) * discretization
     other_loss = lambda index: (index + other._lower_loss) * discretization
 
-    self_probs, other_probs = self._probs, other._probs
+    # The loops below access single entries, which is faster on Python lists
+    # than on NumPy arrays.
+    self_probs, other_probs = self._probs.tolist(), other._probs.tolist()
     len_self, len_other = len(self_probs), len(other_probs)
-    delta = (self._infinity_mass + other._infinity_mass
-             - self._infinity_mass * other._infinity_mass)
+    delta = _compose_infinity_masses(self._infinity_mass, other._infinity_mass)
     # pylint: enable=protected-access
 
     # Compute the hockey stick divergence using equation (2) in the
@@ -425,7 +563,7 @@ class DensePLDPmf(PLDPmf):
     # Else if j is too large then decrease it.
     while j >= 0 and self_loss(i) + other_loss(j - 1) >= epsilon:
       upper_mass += other_probs[j]
-      lower_mass += other_probs[j] * np.exp(-other_loss(j))
+      lower_mass += other_probs[j] * math.exp(-other_loss(j))
       j -= 1
 
     # Invariant:
@@ -434,10 +572,10 @@ class DensePLDPmf(PLDPmf):
     for i in range(i, len_self):
       if j >= 0:
         upper_mass += other_probs[j]
-        lower_mass += other_probs[j] * np.exp(-other_loss(j))
+        lower_mass += other_probs[j] * math.exp(-other_loss(j))
       j -= 1
       delta += self_probs[i] * (
-          upper_mass - np.exp(epsilon - self_loss(i)) * lower_mass)
+          upper_mass - math.exp(epsilon - self_loss(i)) * lower_mass)
 
     return delta
 
@@ -446,42 +584,70 @@ class SparsePLDPmf(PLDPmf):
   """Class for sparse probability mass function.
 
   It represents a discrete probability distribution on a grid of 1d losses with
-  a dictionary. The grid contains numbers multiples of 'discretization'.
+  a pair of arrays, which contain the losses (as integer multiples of
+  'discretization') in ascending order and their respective probabilities.
   """
 
+  __slots__ = ('_rounded_losses', '_probs', '_losses')
+
   def __init__(self, loss_probs: Mapping[int, float], discretization: float,
                infinity_mass: float, pessimistic_estimate: bool):
     super().__init__(discretization, infinity_mass, pessimistic_estimate)
-    self._loss_probs = loss_probs
+    size = len(loss_probs)
+    rounded_losses = np.fromiter(loss_probs.keys(), dtype=np.int64, count=size)
+    probs = np.fromiter(loss_probs.values(), dtype=np.float64, count=size)
+    order = np.argsort(rounded_losses)
+    self._rounded_losses = rounded_losses[order]
+    self._probs = probs[order]
+    # Losses scaled by discretization, computed lazily by _get_losses_probs.
+    self._losses = None
+
+  @classmethod
+  def _from_sorted_arrays(cls, rounded_losses: np.ndarray, probs: np.ndarray,
+                          discretization: float, infinity_mass: float,
+                          pessimistic_estimate: bool) -> 'SparsePLDPmf':
+    """Creates a SparsePLDPmf from rounded losses sorted in ascending order."""
+    pmf = cls.__new__(cls)
+    PLDPmf.__init__(pmf, discretization, infinity_mass, pessimistic_estimate)
+    pmf._rounded_losses = rounded_losses
+    pmf._probs = probs
+    pmf._losses = None
+    return pmf
+
+  @property
+  def _loss_probs(self) -> Mapping[int, float]:
+    """The probability mass function as a dictionary keyed by rounded losses."""
+    return dict(zip(self._rounded_losses.tolist(), self._probs.tolist()))
 
   @property
   def size(self) -> int:
-    return len(self._loss_probs)
+    return len(self._probs)
 
   def compose(self,
               other: 'SparsePLDPmf',
               tail_mass_truncation: float = 0) -> 'SparsePLDPmf':
     """Computes a PMF resulting from composing two PMFs. See base class."""
     self.validate_composable(other)
-    # Assumed small number of points, so simple quadratic algorithm is fine.
-    convolution = {}
+    # Assumed small number of points, so all pairwise sums of losses are formed
+    # at once, and the probabilities of equal sums are added up.
     # pylint: disable=protected-access
-    for key1, value1 in self._loss_probs.items():
-      for key2, value2 in other._loss_probs.items():
-        key = key1 + key2
-        convolution[key] = convolution.get(key, 0.0) + value1 * value2
-    infinity_mass = (self._infinity_mass + other._infinity_mass
-                     - self._infinity_mass * other._infinity_mass)
+    sorted_losses, inverse_indices = np.unique(
+        np.add.outer(self._rounded_losses, other._rounded_losses),
+        return_inverse=True)
+    probs = np.bincount(
+        inverse_indices.ravel(),
+        weights=np.multiply.outer(self._probs, other._probs).ravel(),
+        minlength=len(sorted_losses))
+    infinity_mass = _compose_infinity_masses(self._infinity_mass,
+                                             other._infinity_mass)
     # pylint: enable=protected-access
     # Do truncation.
-    sorted_losses = sorted(convolution.keys())
-    probs = [convolution[loss] for loss in sorted_losses]
     offset, probs, right_mass = _truncate_tails(probs, tail_mass_truncation,
                                                 self._pessimistic_estimate)
     sorted_losses = sorted_losses[offset:offset + len(probs)]
-    truncated_convolution = dict(zip(sorted_losses, probs))
-    return SparsePLDPmf(truncated_convolution, self._discretization,
-                        infinity_mass + right_mass, self._pessimistic_estimate)
+    return SparsePLDPmf._from_sorted_arrays(
+        sorted_losses, probs, self._discretization, infinity_mass + right_mass,
+        self._pessimistic_estimate)
 
   def self_compose(self,
                    num_times: int,
@@ -501,20 +667,53 @@ class SparsePLDPmf(PLDPmf):
       # The size of composed PMF is too large for sparse. Convert to dense.
       return self.to_dense_pmf().self_compose(num_times, tail_mass_truncation)
 
-    result = self
-    for i in range(2, num_times + 1):
-      # To truncate only on the last composition.
-      mass_truncation = 0 if i != num_times else tail_mass_truncation
-      result = result.compose(self, mass_truncation)
+    # Compose by repeated squaring, which takes O(log(num_times)) compositions.
+    # Tails are only truncated at the end.
+    result = None
+    power = self
+    remaining_times = num_times
+    while True:
+      if remaining_times & 1:
+        result = power if result is None else result.compose(power)
+      remaining_times >>= 1
+      if not remaining_times:
+        break
+      power = power.compose(power)
 
-    return result
+    # pylint: disable=protected-access
+    offset, probs, right_mass = _truncate_tails(result._probs,
+                                                tail_mass_truncation,
+                                                self._pessimistic_estimate)
+    rounded_losses = result._rounded_losses[offset:offset + len(probs)]
+    # pylint: enable=protected-access
+    infinity_mass = right_mass + _self_compose_infinity_mass(
+        self._infinity_mass, num_times)
+    return SparsePLDPmf._from_sorted_arrays(
+        rounded_losses, probs, self._discretization, infinity_mass,
+        self._pessimistic_estimate)
 
-  def _get_losses_probs(self) -> Tuple[List[float], List[float]]:
+  def coarsen(self, factor: int) -> 'SparsePLDPmf':
+    """See base class."""
+    self._validate_coarsening_factor(factor)
+    # Rounding is monotone, so the coarsened losses stay sorted.
+    rounded_losses, inverse_indices = np.unique(
+        _coarsen_rounded_losses(self._rounded_losses, factor,
+                                self._pessimistic_estimate),
+        return_inverse=True)
+    probs = np.bincount(inverse_indices, weights=self._probs,
+                        minlength=len(rounded_losses))
+    return SparsePLDPmf._from_sorted_arrays(
+        rounded_losses, probs, self._discretization * factor,
+        self._infinity_mass, self._pessimistic_estimate)
+
+  def _get_losses_probs(self) -> Tuple[np.ndarray, np.ndarray]:
     """Returns losses, sorted ascendingly and respective probabilities."""
-    losses = sorted(list(self._loss_probs.keys()))
-    probs = [self._loss_probs[loss] for loss in losses]
-    losses = [loss * self._discretization for loss in losses]
-    return losses, probs
+    # SparsePLDPmf is never modified after construction (compose returns a new
+    # object), so the scaled losses are computed once and reused by repeated
+    # queries, e.g. when bisecting over epsilon.
+    if self._losses is None:
+      self._losses = self._rounded_losses * self._discretization
+    return self._losses, self._probs
 
   def get_delta_for_epsilon(
       self, epsilon: Union[float, Sequence[float]]) -> Union[float, np.ndarray]:
@@ -541,8 +740,11 @@ class SparsePLDPmf(PLDPmf):
 
   def to_dense_pmf(self) -> DensePLDPmf:
     """"Converts to dense PMF."""
-    lower_loss, probs = common.dictionary_to_list(self._loss_probs)
-    return DensePLDPmf(self._discretization, lower_loss, np.array(probs),
+    lower_loss = int(self._rounded_losses[0])
+    probs = np.zeros(int(self._rounded_losses[-1]) - lower_loss + 1)
+    probs[self._rounded_losses - lower_loss] = self._probs
+    lower_loss, probs = _trim_zero_tails(lower_loss, probs)
+    return DensePLDPmf(self._discretization, lower_loss, probs,
                        self._infinity_mass, self._pessimistic_estimate)
 
 
@@ -570,12 +772,49 @@ def create_pmf(loss_probs: Mapping[int, float], discretization: float,
     return SparsePLDPmf(loss_probs, discretization, infinity_mass,
                         pessimistic_estimate)
 
-  lower_loss, probs = common.dictionary_to_list(loss_probs)
-  probs = np.array(probs)
+  lower_loss, probs = _trim_zero_tails(*common.dictionary_to_list(loss_probs))
   return DensePLDPmf(discretization, lower_loss, probs, infinity_mass,
                      pessimistic_estimate)
 
 
+def create_pmf_from_arrays(rounded_losses: ArrayLike, probs: ArrayLike,
+                           discretization: float, infinity_mass: float,
+                           pessimistic_estimate: bool) -> PLDPmf:
+  """Creates PLDPmfs from arrays of rounded losses and probabilities.
+
+  This is the same as create_pmf, with the probability mass function given as a
+  pair of arrays instead of a dictionary, so that no dictionary needs to be
+  built by callers which compute the losses and probabilities with NumPy.
+
+  Args:
+    rounded_losses: the losses of the discretized privacy loss distribution, as
+      integer multiples of discretization, in strictly increasing order.
+    probs: the probabilities of the respective rounded_losses.
+    discretization: the interval length for which the values of the privacy loss
+      distribution are discretized.
+    infinity_mass: infinity_mass for privacy loss distribution.
+    pessimistic_estimate: whether the rounding is done in such a way that the
+      resulting epsilon-hockey stick divergence computation gives an upper
+      estimate to the real value.
+
+  Returns:
+    Created PLDPmf.
+  """
+  rounded_losses = np.asarray(rounded_losses, dtype=np.int64)
+  probs = np.asarray(probs, dtype=np.float64)
+  if len(probs) <= _MAX_PMF_SPARSE_SIZE:
+    return SparsePLDPmf._from_sorted_arrays(  # pylint: disable=protected-access
+        rounded_losses, probs, discretization, infinity_mass,
+        pessimistic_estimate)
+
+  lower_loss = int(rounded_losses[0])
+  dense_probs = np.zeros(int(rounded_losses[-1]) - lower_loss + 1)
+  dense_probs[rounded_losses - lower_loss] = probs
+  lower_loss, dense_probs = _trim_zero_tails(lower_loss, dense_probs)
+  return DensePLDPmf(discretization, lower_loss, dense_probs, infinity_mass,
+                     pessimistic_estimate)
+
+
 def create_pmf_pessimistic_connect_dots(
     discretization: float,
     rounded_epsilons: numpy.typing.ArrayLike,  # dtype int, shape (n,)
@@ -664,8 +903,9 @@ def create_pmf_pessimistic_connect_dots(
   # probability mass delta_n. Enforce that probabilities are non-negative.
   probs = np.maximum(0, delta_diffs_scaled_v1 + delta_diffs_scaled_v2)
 
-  return create_pmf(
-      loss_probs=dict(zip(rounded_epsilons, probs)),
+  return create_pmf_from_arrays(
+      rounded_losses=rounded_epsilons,
+      probs=probs,
       discretization=discretization,
       infinity_mass=deltas[-1],
       pessimistic_estimate=True)
@@ -774,9 +1014,10 @@ def create_pmf_pessimistic_connect_dots_fixed_gap(
   # Enforce that probabilities are non-negative.
   probs = np.maximum(0.0, probs)
 
-  return create_pmf(
-      loss_probs=dict(
-          zip(range(rounded_epsilon_lower, rounded_epsilon_upper + 1), probs)),
+  return create_pmf_from_arrays(
+      rounded_losses=np.arange(rounded_epsilon_lower,
+                               rounded_epsilon_upper + 1),
+      probs=probs,
       discretization=discretization,
       infinity_mass=deltas[-1],
       pessimistic_estimate=True)
@@ -808,3 +1049,81 @@ def compose_pmfs(pmf1: PLDPmf,
   pmf1 = pmf1.to_dense_pmf()
   pmf2 = pmf2.to_dense_pmf()
   return pmf1.compose(pmf2, tail_mass_truncation)
+
+
+def compose_many_pmfs(pmfs: Sequence[PLDPmf],
+                      tail_mass_truncation: float = 0) -> PLDPmf:
+  """Computes a PMF resulting from composing several PMFs.
+
+  This is equivalent to composing the PMFs one by one with compose_pmfs, except
+  that the tails are truncated only once, on the final result. Dense results
+  are computed with a single FFT round trip: the real FFTs of all PMFs are
+  multiplied together before one inverse FFT. The infinity mass is accumulated
+  as a sum of log1p(-infinity_mass) terms, which avoids the rounding errors of
+  composing the infinity masses pairwise.
+
+  It returns SparsePLDPmf only if all input PLDPmfs are SparsePLDPmf and the
+  product of their sizes is at most MAX_PMF_SPARSE_SIZE.
+
+  Args:
+    pmfs: the privacy loss distribution PMFs to be composed. All of them must
+      have the same discretization and pessimistic_estimate.
+    tail_mass_truncation: an upper bound on the tails of the probability mass of
+      the PMF that might be truncated.
+
+  Returns:
+    A PMF which is the result of convolving (composing) all of pmfs.
+
+  Raises:
+    ValueError: If pmfs is empty or if the PMFs cannot be composed.
+  """
+  if not pmfs:
+    raise ValueError('pmfs should contain at least one PMF.')
+  if len(pmfs) == 1:
+    return pmfs[0]
+
+  max_result_size = math.prod(pmf.size for pmf in pmfs)
+  use_sparse = (all(isinstance(pmf, SparsePLDPmf) for pmf in pmfs) and
+                max_result_size <= _MAX_PMF_SPARSE_SIZE)
+  if not use_sparse:
+    pmfs = [pmf.to_dense_pmf() for pmf in pmfs]
+  first_pmf = pmfs[0]
+  for pmf in pmfs[1:]:
+    first_pmf.validate_composable(pmf)
+
+  # pylint: disable=protected-access
+  discretization = first_pmf._discretization
+  pessimistic_estimate = first_pmf._pessimistic_estimate
+  infinity_masses = [pmf._infinity_mass for pmf in pmfs]
+  if any(infinity_mass >= 1 for infinity_mass in infinity_masses):
+    infinity_mass = 1.0
+  else:
+    infinity_mass = -math.expm1(
+        math.fsum(math.log1p(-infinity_mass)
+                  for infinity_mass in infinity_masses))
+
+  if use_sparse:
+    result = first_pmf
+    for pmf in pmfs[1:]:
+      result = result.compose(pmf)
+    offset, probs, right_mass = _truncate_tails(
+        result._probs, tail_mass_truncation, pessimistic_estimate)
+    rounded_losses = result._rounded_losses[offset:offset + len(probs)]
+    return SparsePLDPmf._from_sorted_arrays(
+        rounded_losses, probs, discretization, infinity_mass + right_mass,
+        pessimistic_estimate)
+
+  lower_loss = sum(pmf._lower_loss for pmf in pmfs)
+  output_len = sum(pmf.size - 1 for pmf in pmfs) + 1
+  fast_len = fft.next_fast_len(output_len, real=True)
+  spectrum = fft.rfft(first_pmf._probs, fast_len)
+  for pmf in pmfs[1:]:
+    spectrum *= fft.rfft(pmf._probs, fast_len)
+  # pylint: enable=protected-access
+  probs = fft.irfft(spectrum, fast_len)[:output_len]
+  # Clamp negative round-off errors of FFT.
+  np.maximum(probs, 0, out=probs)
+  offset, probs, right_mass = _truncate_tails(probs, tail_mass_truncation,
+                                              pessimistic_estimate)
+  return DensePLDPmf(discretization, lower_loss + offset, probs,
+                     infinity_mass + right_mass, pessimistic_estimate)
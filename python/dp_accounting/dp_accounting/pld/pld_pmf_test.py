@@ -14,6 +14,7 @@
 """Tests for PLDPmf."""
 
 import unittest
+import weakref
 
 from absl.testing import parameterized
 import numpy as np
@@ -138,6 +139,25 @@ class PLDPmfTest(parameterized.TestCase):
 
     self.assertAlmostEqual(np.inf, pmf.get_epsilon_for_delta(0))
 
+  @parameterized.parameters(False, True)
+  def test_epsilon_for_delta_large_losses(self, dense):
+    # exp(-loss) underflows to zero for these losses.
+    discretization = 100
+    lower_loss = 8  # loss_value
+    probs = np.array([0.5, 0.5])  # probs for losses 800, 900
+    pmf = self._create_pmf(discretization, dense, 0, lower_loss, probs)
+    self.assertAlmostEqual(900, pmf.get_epsilon_for_delta(0.1))
+
+  def test_epsilon_for_delta_repeated_calls_sparse(self):
+    discretization = 0.1
+    probs = np.array([0.1, 0.2, 0.3, 0.4])
+    pmf = self._create_pmf(discretization, False, 0.05, -1, probs)
+    deltas = (0.1, 0.12, 0.1)
+    epsilons = [pmf.get_epsilon_for_delta(delta) for delta in deltas]
+    self.assertEqual(epsilons[0], epsilons[2])
+    for delta, epsilon in zip(deltas, epsilons):
+      self.assertAlmostEqual(delta, pmf.get_delta_for_epsilon(epsilon))
+
   @parameterized.product(
       (
           {
@@ -290,6 +310,22 @@ class PLDPmfTest(parameterized.TestCase):
                                          0.2) + expected_truncated_to_inf_mass
     self.assertAlmostEqual(expected_inf_mass, pmf._infinity_mass)
 
+  @parameterized.parameters((10, 10), (1000, 1000), (1000, 100000))
+  def test_compose_dense_long(self, num_points1: int, num_points2: int):
+    # Uses direct convolution for the short PMFs, FFT for the long ones and
+    # overlap-add FFT for PMFs of very different lengths.
+    probs1 = np.exp(-np.arange(num_points1) / 5.0)
+    probs1 /= probs1.sum()
+    probs2 = np.exp(-np.arange(num_points2) / 5.0)
+    probs2 /= probs2.sum()
+    pmf1 = self._create_pmf(0.1, dense=True, lower_loss=-3, probs=probs1)
+    pmf2 = self._create_pmf(0.1, dense=True, lower_loss=-3, probs=probs2)
+    result = pmf1.compose(pmf2)
+
+    self.assertEqual(-6, result._lower_loss)
+    self.assertTrue(np.all(result._probs >= 0))
+    self.assertSequenceAlmostEqual(np.convolve(probs1, probs2), result._probs)
+
   @parameterized.parameters(False, True)
   def test_compose_different_discretization(self, dense: bool):
     pmf1 = self._create_pmf(discretization=0.1, dense=dense)
@@ -302,6 +338,48 @@ class PLDPmfTest(parameterized.TestCase):
         ValueError, 'Discretization intervals are different: 0.1 != 0.2'):
       pmf1.get_delta_for_epsilon_for_composed_pld(pmf2, 1)
 
+  @parameterized.product(
+      infinity_masses=((1e-17, 3e-17), (0.5, 1.0), (1.0, 1.0)),
+      dense=(False, True))
+  def test_compose_infinity_mass(self, infinity_masses, dense: bool):
+    infinity_mass1, infinity_mass2 = infinity_masses
+    pmf1 = self._create_pmf(0.1, dense, infinity_mass=infinity_mass1)
+    pmf2 = self._create_pmf(0.1, dense, infinity_mass=infinity_mass2)
+    if infinity_mass1 < 1e-10:
+      # 1 - (1 - x) loses all the precision of a tiny x, so the first order
+      # approximation is used as the reference, with a matching tolerance.
+      expected_infinity_mass, tolerance = infinity_mass1 + infinity_mass2, 1e-30
+    else:
+      expected_infinity_mass = 1 - (1 - infinity_mass1) * (1 - infinity_mass2)
+      tolerance = 1e-15
+    self.assertAlmostEqual(
+        expected_infinity_mass,
+        pmf1.compose(pmf2)._infinity_mass,
+        delta=tolerance)
+
+  @parameterized.parameters(False, True)
+  def test_compose_infinity_mass_above_one(self, dense: bool):
+    # Rounding can push the infinity mass slightly above 1.
+    pmf1 = self._create_pmf(0.1, dense, infinity_mass=1 + 2e-16)
+    pmf2 = self._create_pmf(0.1, dense, infinity_mass=0.5)
+    self.assertEqual(1.0, pmf1.compose(pmf2)._infinity_mass)
+    self.assertEqual(
+        1.0, pmf1.self_compose(3, tail_mass_truncation=0)._infinity_mass)
+    self.assertEqual(
+        1.0, pld_pmf.compose_many_pmfs([pmf1, pmf2])._infinity_mass)
+
+  @parameterized.product(infinity_mass=(1e-17, 0.3, 1.0), dense=(False, True))
+  def test_self_compose_infinity_mass(self, infinity_mass, dense: bool):
+    pmf = self._create_pmf(0.1, dense, infinity_mass=infinity_mass)
+    if infinity_mass < 1e-10:
+      expected_infinity_mass, tolerance = 4 * infinity_mass, 1e-30
+    else:
+      expected_infinity_mass, tolerance = 1 - (1 - infinity_mass)**4, 1e-15
+    self.assertAlmostEqual(
+        expected_infinity_mass,
+        pmf.self_compose(4, tail_mass_truncation=0)._infinity_mass,
+        delta=tolerance)
+
   @parameterized.parameters(False, True)
   def test_compose_different_estimation(self, dense: bool):
     pmf1 = self._create_pmf(
@@ -314,12 +392,57 @@ class PLDPmfTest(parameterized.TestCase):
     with self.assertRaisesRegex(ValueError, 'Estimation types are different'):
       pmf1.get_delta_for_epsilon_for_composed_pld(pmf2, 1)
 
+  @parameterized.product(
+      (
+          {
+              'pessimistic_estimate': True,
+              'expected_lower_loss': -1,
+              'expected_probs': np.array([0.3, 0.55, 0.15]),
+          },
+          {
+              'pessimistic_estimate': False,
+              'expected_lower_loss': -2,
+              'expected_probs': np.array([0.1, 0.5, 0.4]),
+          },
+      ),
+      dense=(False, True))
+  def test_coarsen(self, pessimistic_estimate: bool, expected_lower_loss: int,
+                   expected_probs: np.ndarray, dense: bool):
+    pmf = self._create_pmf(
+        discretization=0.1,
+        dense=dense,
+        infinity_mass=0.05,
+        lower_loss=-3,
+        probs=np.array([0.1, 0.2, 0.3, 0.25, 0.15]),
+        pessimistic_estimate=pessimistic_estimate)
+
+    coarsened = pmf.coarsen(2)
+
+    self.assertIsInstance(coarsened, type(pmf))
+    self.assertAlmostEqual(0.2, coarsened._discretization)
+    self.assertEqual(0.05, coarsened._infinity_mass)
+    self.assertEqual(pessimistic_estimate, coarsened._pessimistic_estimate)
+    dense_pmf = coarsened.to_dense_pmf()
+    self.assertEqual(expected_lower_loss, dense_pmf._lower_loss)
+    self.assertSequenceAlmostEqual(expected_probs, dense_pmf._probs)
+
+  @parameterized.product(factor=(0, -1, 1.5), dense=(False, True))
+  def test_coarsen_invalid_factor(self, factor, dense: bool):
+    pmf = self._create_pmf(discretization=0.1, dense=dense)
+    with self.assertRaisesRegex(ValueError, 'factor should be a positive'):
+      pmf.coarsen(factor)
+
   @parameterized.parameters(
       {
           'num_times': 2,
           'tail_mass_truncation': 0,
           'expected_lower_loss': -2,
           'expected_probs': np.array([0.04, 0.28, 0.49]),
+      }, {
+          'num_times': 3,
+          'tail_mass_truncation': 0,
+          'expected_lower_loss': -3,
+          'expected_probs': np.array([0.008, 0.084, 0.294, 0.343]),
       }, {
           'num_times': 5,
           'tail_mass_truncation': 0,
@@ -404,6 +527,22 @@ class PLDPmfTest(parameterized.TestCase):
         pmf_result._infinity_mass,
         tail_mass_truncation - np.expm1(num_times * np.log1p(-infinity_mass)))
 
+  def test_self_compose_dense_repeated_calls(self):
+    probs = np.array([0.2, 0.5, 0.3])
+    pmf_input = self._create_pmf(0.1, lower_loss=-1, probs=probs, dense=True)
+    for num_times in (8, 20, 8, 50, 100):
+      pmf_result = pmf_input.self_compose(num_times, tail_mass_truncation=0)
+      expected_result = self._create_pmf(
+          0.1, lower_loss=-1, probs=probs, dense=True).self_compose(
+              num_times, tail_mass_truncation=0)
+      self.assertEqual(expected_result._lower_loss, pmf_result._lower_loss)
+      self.assertSequenceAlmostEqual(expected_result._probs, pmf_result._probs)
+
+  @parameterized.parameters(False, True)
+  def test_weak_reference(self, dense: bool):
+    pmf = self._create_pmf(0.1, dense=dense)
+    self.assertIs(pmf, weakref.ref(pmf)())
+
   @parameterized.parameters((1, True), (100, True), (1000, True), (1001, False))
   def test_pmf_creation(self, num_points: int, is_sparse: bool):
     probs = np.ones(num_points) / num_points
@@ -422,6 +561,35 @@ class PLDPmfTest(parameterized.TestCase):
 
     self.assertEqual(num_points, pmf.size)
 
+  @parameterized.parameters((1, True), (1000, True), (1001, False))
+  def test_pmf_creation_from_arrays(self, num_points: int, is_sparse: bool):
+    # Every other loss is in the support.
+    rounded_losses = 2 * np.arange(num_points) - 3
+    probs = np.ones(num_points) / num_points
+    pmf = pld_pmf.create_pmf_from_arrays(rounded_losses, probs, 0.01, 0.1, True)
+    expected_pmf = pld_pmf.create_pmf(
+        dict(zip(rounded_losses.tolist(), probs)), 0.01, 0.1, True)
+
+    self.assertIsInstance(
+        pmf, pld_pmf.SparsePLDPmf if is_sparse else pld_pmf.DensePLDPmf)
+    self.assertIsInstance(pmf, type(expected_pmf))
+    self.assertEqual(0.01, pmf._discretization)
+    self.assertEqual(0.1, pmf._infinity_mass)
+    self.assertEqual(-3, pmf.to_dense_pmf()._lower_loss)
+    self.assertSequenceAlmostEqual(expected_pmf.to_dense_pmf()._probs,
+                                   pmf.to_dense_pmf()._probs)
+
+  def test_pmf_creation_trims_zero_tails(self):
+    probs = np.zeros(1010)
+    probs[5:1005] = 1 / 1000
+    # Losses with zero probability at both ends of the support.
+    loss_probs = dict(zip(range(-2, 1008), probs))
+    pmf = pld_pmf.create_pmf(loss_probs, 0.01, 0, True)
+
+    self.assertIsInstance(pmf, pld_pmf.DensePLDPmf)
+    self.assertEqual(3, pmf._lower_loss)
+    self.assertSequenceAlmostEqual(probs[5:1005], pmf._probs)
+
   @parameterized.named_parameters(
       dict(testcase_name='empty',
            discretization=0.1,
@@ -672,6 +840,57 @@ class PLDPmfTest(parameterized.TestCase):
     else:
       self.assertIsInstance(pmf, pld_pmf.DensePLDPmf)
 
+  @parameterized.parameters(((2, 3, 4), True), ((2, 3, 200), False),
+                            ((100, 100, 100), False))
+  def test_compose_many_pmfs(self, sizes, is_sparse):
+    discretization = 0.01
+    pmfs = []
+    for i, size in enumerate(sizes):
+      probs = np.arange(1, size + 1, dtype=float)
+      probs /= 1.1 * probs.sum()
+      pmfs.append(self._create_pmf(
+          discretization, dense=False, infinity_mass=0.01 * (i + 1),
+          lower_loss=-i, probs=probs))
+
+    pmf = pld_pmf.compose_many_pmfs(pmfs)
+
+    expected_pmf = pmfs[0]
+    for other_pmf in pmfs[1:]:
+      expected_pmf = pld_pmf.compose_pmfs(expected_pmf, other_pmf)
+    self.assertIsInstance(
+        pmf, pld_pmf.SparsePLDPmf if is_sparse else pld_pmf.DensePLDPmf)
+    self.assertEqual(discretization, pmf._discretization)
+    self.assertAlmostEqual(expected_pmf._infinity_mass, pmf._infinity_mass)
+    expected_dense_pmf = expected_pmf.to_dense_pmf()
+    dense_pmf = pmf.to_dense_pmf()
+    self.assertEqual(expected_dense_pmf._lower_loss, dense_pmf._lower_loss)
+    self.assertSequenceAlmostEqual(expected_dense_pmf._probs, dense_pmf._probs)
+
+  def test_compose_many_pmfs_truncation(self):
+    probs = np.array([0.01, 0.49, 0.49, 0.01])
+    pmfs = [self._create_pmf(0.1, dense=True, probs=probs)] * 3
+
+    pmf = pld_pmf.compose_many_pmfs(pmfs, tail_mass_truncation=3e-6)
+
+    # The first and the last entries of the composition have mass 1e-6 each.
+    self.assertEqual(1, pmf._lower_loss)
+    self.assertLen(pmf._probs, 8)
+    self.assertAlmostEqual(1e-6, pmf._infinity_mass)
+    self.assertAlmostEqual(1 - 1e-6, np.sum(pmf._probs))
+
+  def test_compose_many_pmfs_single(self):
+    pmf = self._create_pmf(0.1, dense=True)
+    self.assertIs(pmf, pld_pmf.compose_many_pmfs([pmf]))
+
+  def test_compose_many_pmfs_value_errors(self):
+    with self.assertRaisesRegex(ValueError, 'at least one PMF'):
+      pld_pmf.compose_many_pmfs([])
+    pmf1 = self._create_pmf(discretization=0.1, dense=True)
+    pmf2 = self._create_pmf(discretization=0.2, dense=False)
+    with self.assertRaisesRegex(
+        ValueError, 'Discretization intervals are different: 0.1 != 0.2'):
+      pld_pmf.compose_many_pmfs([pmf1, pmf2])
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -21,9 +21,11 @@ supplementary material below for more details:
 """
 
 import collections
+import functools
 import logging
 import math
-from typing import Any, Callable, Mapping, Optional, Sequence, Tuple, Union
+from typing import (Any, Callable, List, Mapping, Optional, Sequence, Tuple,
+                    Union)
 
 import numpy as np
 
@@ -32,6 +34,10 @@ from dp_accounting.pld import common
 from dp_accounting.pld import pld_pmf
 from dp_accounting.pld import privacy_loss_mechanism
 
+# Maximum number of rounded probability mass functions of closed-form
+# mechanisms (e.g., Randomized Response) that are cached.
+_ROUNDED_PMF_CACHE_SIZE = 256
+
 
 def _deprecation_warning(method_name: str):
   logging.warning('PrivacyLossDistribution.%s() will be deprecated shortly. '
@@ -93,6 +99,11 @@ class PrivacyLossDistribution:
     _symmetric: When True, _pmf_add is assumed to be the same as _pmf_remove.
   """
 
+  # Many intermediate PLDs are created during composition and searches over
+  # parameters, so instances are kept small by not having a __dict__.
+  # __weakref__ keeps instances weakly referenceable.
+  __slots__ = ('_pmf_remove', '_pmf_add', '_symmetric', '__weakref__')
+
   def __init__(self,
                pmf_remove: pld_pmf.PLDPmf,
                pmf_add: Optional[pld_pmf.PLDPmf] = None):
@@ -609,6 +620,39 @@ class PrivacyLossDistribution:
     # pylint:enable=protected-access
     return PrivacyLossDistribution(pld_pmf_remove, pld_pmf_add)
 
+  def compose_many(
+      self,
+      privacy_loss_distributions: Sequence['PrivacyLossDistribution'],
+      tail_mass_truncation: float = 1e-15,
+  ) -> 'PrivacyLossDistribution':
+    """Computes a privacy loss distribution resulting from composing many PLDs.
+
+    This is equivalent to repeatedly calling compose, but faster: the tails are
+    truncated only once and dense PMFs are composed with a single FFT round
+    trip. See pld_pmf.compose_many_pmfs for details.
+
+    Args:
+      privacy_loss_distributions: the privacy loss distributions to be composed
+        with the current privacy loss distribution. All of them must have the
+        same value_discretization_interval as the current one.
+      tail_mass_truncation: an upper bound on the tails of the probability mass
+        of the PLD that might be truncated.
+
+    Returns:
+      A privacy loss distribution which is the result of composing the current
+      privacy loss distribution with all of privacy_loss_distributions.
+    """
+    plds = [self, *privacy_loss_distributions]
+    # pylint:disable=protected-access
+    pld_pmf_remove = pld_pmf.compose_many_pmfs(
+        [pld._pmf_remove for pld in plds], tail_mass_truncation)
+    if all(pld._symmetric for pld in plds):
+      return PrivacyLossDistribution(pld_pmf_remove)
+    pld_pmf_add = pld_pmf.compose_many_pmfs(
+        [pld._pmf_add for pld in plds], tail_mass_truncation)
+    # pylint:enable=protected-access
+    return PrivacyLossDistribution(pld_pmf_remove, pld_pmf_add)
+
   def get_delta_for_epsilon_for_composed_pld(
       self, privacy_loss_distribution: 'PrivacyLossDistribution',
       epsilon: float) -> float:
@@ -660,6 +704,32 @@ class PrivacyLossDistribution:
     pmf_add = self._pmf_add.self_compose(num_times, tail_mass_truncation)
     return PrivacyLossDistribution(pmf_remove, pmf_add)
 
+  def coarsen(self, factor: int) -> 'PrivacyLossDistribution':
+    """Computes PLD on a discretization grid which is factor times coarser.
+
+    The privacy losses are rounded to multiples of factor times the current
+    discretization interval, in the same direction as the original rounding
+    (up for pessimistic estimates, down otherwise). For a pessimistic PLD the
+    result is therefore still an upper bound on the hockey stick divergence.
+    Coarsening a PLD whose support has grown, e.g. after many compositions,
+    reduces the cost of its further compositions at the expense of accuracy.
+
+    Args:
+      factor: the ratio of the new discretization interval to the current one.
+        Must be a positive integer.
+
+    Returns:
+      A privacy loss distribution with discretization interval factor times
+      the current one.
+
+    Raises:
+      ValueError: If factor is not a positive integer.
+    """
+    pmf_remove = self._pmf_remove.coarsen(factor)
+    if self._symmetric:
+      return PrivacyLossDistribution(pmf_remove)
+    return PrivacyLossDistribution(pmf_remove, self._pmf_add.coarsen(factor))
+
 
 def identity(
     value_discretization_interval: float = 1e-4) -> PrivacyLossDistribution:
@@ -679,6 +749,137 @@ def identity(
       {0: 1}, 0, value_discretization_interval)
 
 
+def _discretize_pessimistic(privacy_losses: np.ndarray,
+                            value_discretization_interval: float) -> np.ndarray:
+  """Rounds privacy losses up to multiples of value_discretization_interval.
+
+  Args:
+    privacy_losses: the (finite) privacy loss values.
+    value_discretization_interval: the dicretization interval.
+
+  Returns:
+    The integer array of the rounded privacy losses divided by
+    value_discretization_interval.
+  """
+  return np.ceil(
+      np.asarray(privacy_losses, dtype=float) /
+      value_discretization_interval).astype(np.int64)
+
+
+def _discretize_optimistic(privacy_losses: np.ndarray,
+                           value_discretization_interval: float) -> np.ndarray:
+  """Rounds privacy losses down to multiples of value_discretization_interval.
+
+  Args:
+    privacy_losses: the (finite) privacy loss values.
+    value_discretization_interval: the dicretization interval.
+
+  Returns:
+    The integer array of the rounded privacy losses divided by
+    value_discretization_interval.
+  """
+  return np.floor(
+      np.asarray(privacy_losses, dtype=float) /
+      value_discretization_interval).astype(np.int64)
+
+
+def _aggregate_rounded_probability_mass(
+    rounded_values: np.ndarray,
+    probability_mass: np.ndarray) -> Mapping[int, float]:
+  """Same as _sum_by_rounded_value, but returns the result as a dictionary.
+
+  Args:
+    rounded_values: the privacy loss values, rounded to integer multiples of
+      the discretization interval and divided by it.
+    probability_mass: the probability mass of each entry of rounded_values.
+
+  Returns:
+    A dictionary mapping each distinct entry of rounded_values to the total
+    probability mass of that entry.
+  """
+  unique_values, summed_probability_mass = _sum_by_rounded_value(
+      rounded_values, probability_mass)
+  return dict(zip(unique_values.tolist(), summed_probability_mass.tolist()))
+
+
+def _sum_by_rounded_value(
+    rounded_values: np.ndarray,
+    probability_mass: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+  """Sums up the probability masses of equal rounded privacy loss values.
+
+  Args:
+    rounded_values: the privacy loss values, rounded to integer multiples of
+      the discretization interval and divided by it.
+    probability_mass: the probability mass of each entry of rounded_values.
+
+  Returns:
+    A pair of arrays: the distinct entries of rounded_values in increasing
+    order, and the total probability mass of each of them.
+  """
+  unique_values, inverse_indices = np.unique(
+      np.asarray(rounded_values, dtype=np.int64), return_inverse=True)
+  summed_probability_mass = np.bincount(
+      inverse_indices, weights=probability_mass, minlength=len(unique_values))
+  return unique_values, summed_probability_mass
+
+
+def _create_rounded_probability_mass_function(
+    log_pmf_lower: Mapping[Any, float],
+    log_pmf_upper: Mapping[Any, float],
+    pessimistic_estimate: bool,
+    value_discretization_interval: float,
+    log_mass_truncation_bound: float = -math.inf,
+) -> Tuple[float, Mapping[int, float]]:
+  """Creates the rounded privacy loss pmf of mu_upper with respect to mu_lower.
+
+  See from_two_probability_mass_functions for a description of the arguments.
+
+  Returns:
+    A pair of the infinity mass and the rounded probability mass function of
+    the privacy loss distribution.
+  """
+  # When an outcome only appears in the upper distribution but not in the
+  # lower distribution, then it must be counted in infinity_mass as such an
+  # outcome contributes to the hockey stick divergence.
+  get_log_prob_lower = log_pmf_lower.get
+  infinity_log_probs = [np.fromiter(
+      (log_prob_upper for outcome, log_prob_upper in log_pmf_upper.items()
+       if get_log_prob_lower(outcome, -math.inf) == -math.inf),
+      dtype=float)]
+  # Collect the log probability masses of the outcomes of mu_lower in a single
+  # pass over the dictionary. Outcomes that never occur in mu_lower were
+  # already collected for infinity_mass above.
+  get_log_prob_upper = log_pmf_upper.get
+  log_probs_lower = np.fromiter(log_pmf_lower.values(), dtype=float,
+                                count=len(log_pmf_lower))
+  log_probs_upper = np.fromiter(
+      (get_log_prob_upper(outcome, -math.inf) for outcome in log_pmf_lower),
+      dtype=float, count=len(log_pmf_lower))
+  occurs_in_lower = log_probs_lower != -math.inf
+  log_probs_lower = log_probs_lower[occurs_in_lower]
+  log_probs_upper = log_probs_upper[occurs_in_lower]
+  # Outcomes whose probability mass of mu_upper is greater than the threshold
+  # are added to the distribution.
+  above_bound = log_probs_upper > log_mass_truncation_bound
+  if pessimistic_estimate:
+    # When the probability mass of mu_upper at the outcome is no more than the
+    # threshold and we would like to get a pessimistic estimate, account for
+    # this in infinity_mass.
+    infinity_log_probs.append(log_probs_upper[~above_bound])
+  infinity_mass = float(np.sum(np.exp(np.concatenate(infinity_log_probs))))
+  privacy_loss_values = (log_probs_upper[above_bound] -
+                         log_probs_lower[above_bound])
+  # Discretize the probability mass so that the values are integer multiples
+  # of value_discretization_interval, and aggregate the masses of the values
+  # rounded to the same multiple.
+  discretize = (_discretize_pessimistic if pessimistic_estimate
+                else _discretize_optimistic)
+  rounded_pmf = _aggregate_rounded_probability_mass(
+      discretize(privacy_loss_values, value_discretization_interval),
+      np.exp(log_probs_upper[above_bound]))
+  return infinity_mass, rounded_pmf
+
+
 def from_two_probability_mass_functions(
     log_probability_mass_function_lower: Mapping[Any, float],
     log_probability_mass_function_upper: Mapping[Any, float],
@@ -716,51 +917,13 @@ def from_two_probability_mass_functions(
     The privacy loss distribution constructed as specified.
   """
 
-  def _create_rounded_probability_mass_function(
-      log_pmf_lower: Mapping[Any, float],
-      log_pmf_upper: Mapping[Any, float]
-  ) -> Tuple[float, Mapping[int, float]]:
-    """Helper function for creating rounded pmf."""
-    infinity_mass = 0
-    for outcome in log_pmf_upper:
-      if log_pmf_lower.get(outcome, -math.inf) == -math.inf:
-        # When an outcome only appears in the upper distribution but not in the
-        # lower distribution, then it must be counted in infinity_mass as such
-        # an outcome contributes to the hockey stick divergence.
-        infinity_mass += math.exp(log_pmf_upper[outcome])
-    # Compute the (non-discretized) probability mass function for the privacy
-    # loss distribution.
-    pmf = {}
-    for outcome, log_prob_lower in log_pmf_lower.items():
-      if log_prob_lower == -math.inf:
-        # This outcome never occurs in mu_lower. This case was already included
-        # as infinity_mass above.
-        continue
-      elif log_pmf_upper.get(outcome, -math.inf) > log_mass_truncation_bound:
-        # When the probability mass of mu_upper at the outcome is greater than
-        # the threshold, add it to the distribution.
-        privacy_loss_value = log_pmf_upper[outcome] - log_prob_lower
-        pmf[privacy_loss_value] = (
-            pmf.get(privacy_loss_value, 0) + math.exp(log_pmf_upper[outcome])
-        )
-      else:
-        if pessimistic_estimate:
-          # When the probability mass of mu_upper at the outcome is no more than
-          # the threshold and we would like to get a pessimistic estimate,
-          # account for this in infinity_mass.
-          infinity_mass += math.exp(log_pmf_upper.get(outcome, -math.inf))
-    # Discretize the probability mass so that the values are integer multiples
-    # of value_discretization_interval
-    rounded_pmf = collections.defaultdict(lambda: 0)
-    round_fn = math.ceil if pessimistic_estimate else math.floor
-    for val in pmf:
-      rounded_pmf[round_fn(val / value_discretization_interval)] += pmf[val]
-    return infinity_mass, rounded_pmf
-
   infinity_mass, rounded_probability_mass_function = (
       _create_rounded_probability_mass_function(
           log_pmf_lower=log_probability_mass_function_lower,
-          log_pmf_upper=log_probability_mass_function_upper
+          log_pmf_upper=log_probability_mass_function_upper,
+          pessimistic_estimate=pessimistic_estimate,
+          value_discretization_interval=value_discretization_interval,
+          log_mass_truncation_bound=log_mass_truncation_bound,
       )
   )
 
@@ -774,6 +937,9 @@ def from_two_probability_mass_functions(
       _create_rounded_probability_mass_function(
           log_pmf_lower=log_probability_mass_function_upper,
           log_pmf_upper=log_probability_mass_function_lower,
+          pessimistic_estimate=pessimistic_estimate,
+          value_discretization_interval=value_discretization_interval,
+          log_mass_truncation_bound=log_mass_truncation_bound,
       )
   )
   return PrivacyLossDistribution.create_from_rounded_probability(
@@ -876,65 +1042,78 @@ def _create_pld_pmf_from_monotone_privacy_loss(
             rounded_epsilon_upper,
             deltas)
 
-  round_fn = math.ceil if pessimistic_estimate else math.floor
+  discretize = (_discretize_pessimistic if pessimistic_estimate
+                else _discretize_optimistic)
 
   tail_pld = monotone_privacy_loss.privacy_loss_tail()
   lower_x, upper_x = tail_pld.lower_x_truncation, tail_pld.upper_x_truncation
 
-  rounded_probability_mass_function = collections.defaultdict(lambda: 0)
   infinity_mass = tail_pld.tail_probability_mass_function.get(math.inf, 0)
-  for privacy_loss in tail_pld.tail_probability_mass_function:
-    if privacy_loss != math.inf:
-      rounded_probability_mass_function[round_fn(
-          privacy_loss / value_discretization_interval
-      )] += tail_pld.tail_probability_mass_function[privacy_loss]
+  tail_privacy_losses = [
+      privacy_loss
+      for privacy_loss in tail_pld.tail_probability_mass_function
+      if privacy_loss != math.inf
+  ]
+  tail_rounded_values = discretize(tail_privacy_losses,
+                                   value_discretization_interval)
+  tail_probability_mass = np.array([
+      tail_pld.tail_probability_mass_function[privacy_loss]
+      for privacy_loss in tail_privacy_losses
+  ], dtype=float)
 
   if monotone_privacy_loss.is_discrete:
-    xs = list(range(math.ceil(lower_x) - 1, math.floor(upper_x) + 1))
+    xs = np.arange(math.ceil(lower_x) - 1, math.floor(upper_x) + 1,
+                   dtype=np.int64)
 
     # Compute PMF for the x's. Note that a vectorized call to mu_upper_cdf can
     # be much faster than many scalar calls.
-    cdf_values = monotone_privacy_loss.mu_upper_cdf(xs)
-    probability_mass = cdf_values[1:] - cdf_values[:-1]
+    probability_mass = np.diff(monotone_privacy_loss.mu_upper_cdf(xs))
 
-    for x, prob in zip(xs[1:], probability_mass):
-      rounded_probability_mass_function[round_fn(
-          monotone_privacy_loss.privacy_loss(x) /
-          value_discretization_interval)] += prob
+    # privacy_loss only accepts scalars, but the rounding is vectorized.
+    privacy_losses = np.fromiter(
+        (monotone_privacy_loss.privacy_loss(x) for x in xs[1:].tolist()),
+        dtype=float, count=len(xs) - 1)
+    rounded_values = discretize(privacy_losses, value_discretization_interval)
   else:
-    rounded_down_value = math.floor(
+    first_rounded_down_value = rounded_down_value = math.floor(
         monotone_privacy_loss.privacy_loss(lower_x) /
         value_discretization_interval)
     upper_x_privacy_loss = monotone_privacy_loss.privacy_loss(upper_x)
 
     # Compute discretization intervals for PLD approximation.
-    xs, rounded_values = [lower_x], []
+    inverse_privacy_loss = monotone_privacy_loss.inverse_privacy_loss
+    xs = [lower_x]
     x = lower_x
     while x < upper_x:
       if (value_discretization_interval * rounded_down_value <=
           upper_x_privacy_loss):
         x = upper_x
       else:
-        x = monotone_privacy_loss.inverse_privacy_loss(
+        x = inverse_privacy_loss(
             value_discretization_interval * rounded_down_value)
 
       xs.append(x)
-      rounded_values.append(round_fn(rounded_down_value + 0.5))
       rounded_down_value -= 1
 
     # Compute PLD for discretization intervals. Note that a vectorized call to
     # mu_upper_cdf is much faster than many scalar calls.
-    cdf_values = monotone_privacy_loss.mu_upper_cdf(xs)
-    probability_mass = cdf_values[1:] - cdf_values[:-1]
+    probability_mass = np.diff(monotone_privacy_loss.mu_upper_cdf(xs))
 
     # Each x in [lower_x, upper_x] results in privacy loss that lies in
     # [value_discretization_interval * rounded_down_value,
     #  value_discretization_interval * (rounded_down_value + 1)]
-    for rounded_value, prob in zip(rounded_values, probability_mass):
-      rounded_probability_mass_function[rounded_value] += prob
-
-  return pld_pmf.create_pmf(
-      dict(rounded_probability_mass_function),
+    # so it is rounded to rounded_down_value + 1 in the pessimistic case and to
+    # rounded_down_value otherwise.
+    rounded_values = (first_rounded_down_value - np.arange(len(xs) - 1) +
+                      (1 if pessimistic_estimate else 0))
+
+  unique_rounded_values, summed_probability_mass = _sum_by_rounded_value(
+      np.concatenate((tail_rounded_values, rounded_values)),
+      np.concatenate((tail_probability_mass, probability_mass)))
+
+  return pld_pmf.create_pmf_from_arrays(
+      unique_rounded_values,
+      summed_probability_mass,
       value_discretization_interval,
       infinity_mass,
       pessimistic_estimate=pessimistic_estimate)
@@ -963,25 +1142,40 @@ def create_from_cdf(
   Returns:
     The privacy loss distribution constructed as specified.
   """
-  rounded_probability_mass_function = {}
-
+  # The probability masses are collected in lists and the dictionary is built
+  # once at the end. Each cdf value is computed once and reused as the end
+  # point of the next interval.
   # Construct the distribution for value greater than or equal to zero.
-  rounded_value = 1 if pessimistic_estimate else 0
+  upper_probability_mass = []
   value = 0
-  while cdf(value) < 1 - tail_mass_truncation / 2:
-    rounded_probability_mass_function[rounded_value] = (
-        cdf(value + value_discretization_interval) - cdf(value))
-    rounded_value += 1
+  cdf_value = cdf(value)
+  while cdf_value < 1 - tail_mass_truncation / 2:
     value += value_discretization_interval
+    next_cdf_value = cdf(value)
+    upper_probability_mass.append(next_cdf_value - cdf_value)
+    cdf_value = next_cdf_value
 
   # Construct the distribution for value less than zero.
-  rounded_value = 0 if pessimistic_estimate else -1
+  lower_probability_mass = []
   value = 0
-  while cdf(value) > tail_mass_truncation / 2:
-    rounded_probability_mass_function[rounded_value] = (
-        cdf(value) - cdf(value - value_discretization_interval))
-    rounded_value -= 1
+  cdf_value = cdf(value)
+  while cdf_value > tail_mass_truncation / 2:
     value -= value_discretization_interval
+    next_cdf_value = cdf(value)
+    lower_probability_mass.append(cdf_value - next_cdf_value)
+    cdf_value = next_cdf_value
+
+  first_upper_rounded_value = 1 if pessimistic_estimate else 0
+  rounded_probability_mass_function = dict(
+      zip(
+          range(first_upper_rounded_value,
+                first_upper_rounded_value + len(upper_probability_mass)),
+          upper_probability_mass))
+  rounded_probability_mass_function.update(
+      zip(
+          range(first_upper_rounded_value - 1,
+                first_upper_rounded_value - 1 - len(lower_probability_mass),
+                -1), lower_probability_mass))
 
   return PrivacyLossDistribution.create_from_rounded_probability(
       rounded_probability_mass_function,
@@ -990,6 +1184,68 @@ def create_from_cdf(
       pessimistic_estimate=pessimistic_estimate)
 
 
+@functools.lru_cache(maxsize=_ROUNDED_PMF_CACHE_SIZE)
+def _randomized_response_rounded_pmfs(
+    noise_parameter: float,
+    num_buckets: int,
+    pessimistic_estimate: bool,
+    value_discretization_interval: float,
+    neighboring_relation: privacy_accountant.NeighboringRelation,
+) -> Tuple[float, Tuple[Tuple[int, float], ...], Optional[float],
+           Optional[Tuple[Tuple[int, float], ...]]]:
+  """Computes the rounded privacy loss pmfs of Randomized Response.
+
+  The result only depends on the scalar arguments, so it is cached for repeated
+  calls, e.g., in parameter sweeps. The pmfs are returned as tuples of items so
+  that the cached values cannot be modified by callers.
+
+  See from_randomized_response for a description of the arguments, which are
+  assumed to be already validated.
+
+  Returns:
+    A tuple of the infinity mass and the items of the rounded probability mass
+    function with respect to REMOVE adjacency, followed by the same for ADD
+    adjacency, which are None when the privacy loss distribution is symmetric.
+  """
+  if neighboring_relation == privacy_accountant.NeighboringRelation.REPLACE_ONE:
+    log_pmf_upper = {
+        0: math.log(1 - noise_parameter * (num_buckets - 1) / num_buckets),
+        1: math.log(noise_parameter / num_buckets),
+    }
+    log_pmf_lower = {0: log_pmf_upper[1], 1: log_pmf_upper[0]}
+    if num_buckets > 2:
+      # Since all other buckets correspond to the same privacy loss, we can
+      # combine them into a single bucket.
+      log_pmf_upper[2] = math.log(
+          (num_buckets - 2) * noise_parameter / num_buckets
+      )
+      log_pmf_lower[2] = log_pmf_upper[2]
+    infinity_mass, rounded_pmf = _create_rounded_probability_mass_function(
+        log_pmf_lower, log_pmf_upper, pessimistic_estimate,
+        value_discretization_interval)
+    return infinity_mass, tuple(rounded_pmf.items()), None, None
+  else:  # Case of REPLACE_SPECIAL
+    # Since all buckets other than the input bucket correspond to the same
+    # privacy loss, we can combine them into a single bucket `1`.
+    log_pmf_upper = {
+        0: math.log(1 - noise_parameter * (num_buckets - 1) / num_buckets),
+        1: math.log((num_buckets - 1) * noise_parameter / num_buckets),
+    }
+    log_pmf_lower = {
+        0: - math.log(num_buckets),  # equals log(1 / num_buckets)
+        1: math.log1p(- 1 / num_buckets),  # equals log(1 - 1 / num_buckets)
+    }
+    infinity_mass, rounded_pmf = _create_rounded_probability_mass_function(
+        log_pmf_lower, log_pmf_upper, pessimistic_estimate,
+        value_discretization_interval)
+    infinity_mass_add, rounded_pmf_add = (
+        _create_rounded_probability_mass_function(
+            log_pmf_upper, log_pmf_lower, pessimistic_estimate,
+            value_discretization_interval))
+    return (infinity_mass, tuple(rounded_pmf.items()), infinity_mass_add,
+            tuple(rounded_pmf_add.items()))
+
+
 def from_randomized_response(
     noise_parameter: float,
     num_buckets: int,
@@ -1082,44 +1338,18 @@ def from_randomized_response(
         'Neighboring relation must be either REPLACE_ONE or REPLACE_SPECIAL: '
         f'Found {neighboring_relation}.')
 
-  if neighboring_relation == privacy_accountant.NeighboringRelation.REPLACE_ONE:
-    log_pmf_upper = {
-        0: math.log(1 - noise_parameter * (num_buckets - 1) / num_buckets),
-        1: math.log(noise_parameter / num_buckets),
-    }
-    log_pmf_lower = {0: log_pmf_upper[1], 1: log_pmf_upper[0]}
-    if num_buckets > 2:
-      # Since all other buckets correspond to the same privacy loss, we can
-      # combine them into a single bucket.
-      log_pmf_upper[2] = math.log(
-          (num_buckets - 2) * noise_parameter / num_buckets
-      )
-      log_pmf_lower[2] = log_pmf_upper[2]
-    return from_two_probability_mass_functions(
-        log_pmf_lower,
-        log_pmf_upper,
-        pessimistic_estimate,
-        value_discretization_interval,
-        symmetric=True,
-    )
-  else:  # Case of REPLACE_SPECIAL
-    # Since all buckets other than the input bucket correspond to the same
-    # privacy loss, we can combine them into a single bucket `1`.
-    log_pmf_upper = {
-        0: math.log(1 - noise_parameter * (num_buckets - 1) / num_buckets),
-        1: math.log((num_buckets - 1) * noise_parameter / num_buckets),
-    }
-    log_pmf_lower = {
-        0: - math.log(num_buckets),  # equals log(1 / num_buckets)
-        1: math.log1p(- 1 / num_buckets),  # equals log(1 - 1 / num_buckets)
-    }
-    return from_two_probability_mass_functions(
-        log_pmf_lower,
-        log_pmf_upper,
-        pessimistic_estimate,
-        value_discretization_interval,
-        symmetric=False,
-    )
+  (infinity_mass, rounded_pmf_items, infinity_mass_add,
+   rounded_pmf_add_items) = _randomized_response_rounded_pmfs(
+       noise_parameter, num_buckets, pessimistic_estimate,
+       value_discretization_interval, neighboring_relation)
+  if rounded_pmf_add_items is None:
+    return PrivacyLossDistribution.create_from_rounded_probability(
+        dict(rounded_pmf_items), infinity_mass, value_discretization_interval,
+        pessimistic_estimate)
+  return PrivacyLossDistribution.create_from_rounded_probability(
+      dict(rounded_pmf_items), infinity_mass, value_discretization_interval,
+      pessimistic_estimate, dict(rounded_pmf_add_items), infinity_mass_add,
+      symmetric=False)
 
 
 def _pld_for_subsampled_mechanism(
@@ -1432,6 +1662,54 @@ def from_mixture_gaussian_mechanism(
   return PrivacyLossDistribution(pmf_remove, pmf_add)
 
 
+@functools.lru_cache(maxsize=_ROUNDED_PMF_CACHE_SIZE)
+def _privacy_parameters_rounded_pmf(
+    epsilon: float, delta: float,
+    value_discretization_interval: float) -> Tuple[Tuple[int, float], ...]:
+  """Computes the items of the rounded pmf for from_privacy_parameters.
+
+  The result is cached, and returned as a tuple of items so that the cached
+  value cannot be modified by callers.
+
+  Args:
+    epsilon: the epsilon in (epsilon, delta)-differential privacy.
+    delta: the delta in (epsilon, delta)-differential privacy.
+    value_discretization_interval: the length of the dicretization interval for
+      the privacy loss distribution.
+
+  Returns:
+    The items of the rounded probability mass function of the pessimistic
+    privacy loss distribution, excluding the infinity mass.
+  """
+  rounded_probability_mass_function = collections.defaultdict(float)
+
+  rounded_probability_mass_function[math.ceil(
+      epsilon /
+      value_discretization_interval)] = (1 - delta) / (1 + math.exp(-epsilon))
+  rounded_probability_mass_function[math.ceil(
+      -epsilon /
+      value_discretization_interval)] += (1 - delta) / (1 + math.exp(epsilon))
+  return tuple(rounded_probability_mass_function.items())
+
+
+def _validate_privacy_parameters(
+    privacy_parameters: common.DifferentialPrivacyParameters):
+  """Checks that the privacy parameters describe a finite rounded pmf.
+
+  Args:
+    privacy_parameters: the privacy guarantee of the mechanism.
+
+  Raises:
+    ValueError: If epsilon is not finite or delta is not in [0, 1].
+  """
+  if not math.isfinite(privacy_parameters.epsilon):
+    raise ValueError(
+        f'epsilon should be finite: {privacy_parameters.epsilon}')
+  if not 0 <= privacy_parameters.delta <= 1:
+    raise ValueError(
+        f'delta should be between 0 and 1: {privacy_parameters.delta}')
+
+
 def from_privacy_parameters(
     privacy_parameters: common.DifferentialPrivacyParameters,
     value_discretization_interval: float = 1e-4) -> PrivacyLossDistribution:
@@ -1454,19 +1732,71 @@ def from_privacy_parameters(
 
   Returns:
     The privacy loss distribution constructed as specified.
-  """
-  delta = privacy_parameters.delta
-  epsilon = privacy_parameters.epsilon
-
-  rounded_probability_mass_function = collections.defaultdict(lambda: 0)
 
-  rounded_probability_mass_function[math.ceil(
-      epsilon /
-      value_discretization_interval)] = (1 - delta) / (1 + math.exp(-epsilon))
-  rounded_probability_mass_function[math.ceil(
-      -epsilon /
-      value_discretization_interval)] += (1 - delta) / (1 + math.exp(epsilon))
+  Raises:
+    ValueError: If epsilon is not finite or delta is not in [0, 1].
+  """
+  _validate_privacy_parameters(privacy_parameters)
+  rounded_probability_mass_function = dict(
+      _privacy_parameters_rounded_pmf(privacy_parameters.epsilon,
+                                      privacy_parameters.delta,
+                                      value_discretization_interval))
 
   return PrivacyLossDistribution.create_from_rounded_probability(
       rounded_probability_mass_function, privacy_parameters.delta,
       value_discretization_interval)
+
+
+def from_privacy_parameters_batch(
+    privacy_parameters: Sequence[common.DifferentialPrivacyParameters],
+    value_discretization_interval: float = 1e-4
+) -> List[PrivacyLossDistribution]:
+  """Constructs pessimistic PLDs for a batch of epsilon and delta parameters.
+
+  This is equivalent to calling from_privacy_parameters on each element of
+  privacy_parameters, but the rounding and the probability masses are computed
+  for the whole batch at once, which is faster for sweeps over many parameters.
+
+  Args:
+    privacy_parameters: the privacy guarantees of the mechanisms.
+    value_discretization_interval: the length of the dicretization interval for
+      the privacy loss distributions. The values will be rounded up/down to be
+      integer multiples of this number. Smaller value results in more accurate
+      estimates of the privacy loss, at the cost of increased run-time / memory
+      usage.
+
+  Returns:
+    The list of privacy loss distributions, one for each element of
+    privacy_parameters, constructed as in from_privacy_parameters.
+
+  Raises:
+    ValueError: If any epsilon is not finite or any delta is not in [0, 1].
+  """
+  for parameters in privacy_parameters:
+    _validate_privacy_parameters(parameters)
+  epsilons = np.array([p.epsilon for p in privacy_parameters], dtype=float)
+  deltas = [p.delta for p in privacy_parameters]
+  rounded_epsilons = np.ceil(epsilons / value_discretization_interval)
+  rounded_negative_epsilons = np.ceil(-epsilons / value_discretization_interval)
+  with np.errstate(over='ignore'):
+    upper_probability_mass = (1 - np.array(deltas)) / (1 + np.exp(-epsilons))
+    lower_probability_mass = (1 - np.array(deltas)) / (1 + np.exp(epsilons))
+
+  plds = []
+  for (rounded_epsilon, rounded_negative_epsilon, upper_mass, lower_mass,
+       delta) in zip(rounded_epsilons.astype(np.int64).tolist(),
+                     rounded_negative_epsilons.astype(np.int64).tolist(),
+                     upper_probability_mass.tolist(),
+                     lower_probability_mass.tolist(), deltas):
+    if rounded_epsilon == rounded_negative_epsilon:
+      rounded_probability_mass_function = {
+          rounded_epsilon: upper_mass + lower_mass}
+    else:
+      rounded_probability_mass_function = {
+          rounded_epsilon: upper_mass,
+          rounded_negative_epsilon: lower_mass
+      }
+    plds.append(PrivacyLossDistribution.create_from_rounded_probability(
+        rounded_probability_mass_function, delta,
+        value_discretization_interval))
+  return plds
@@ -15,8 +15,10 @@
 import math
 from typing import Any, Mapping, Optional
 import unittest
+import weakref
 
 from absl.testing import parameterized
+import numpy as np
 from scipy import stats
 
 from dp_accounting import privacy_accountant
@@ -408,6 +410,25 @@ class AddRemovePrivacyLossDistributionTest(parameterized.TestCase):
           expected_result.get_delta_for_epsilon(-0.5),
           result.get_delta_for_epsilon(-0.5))
 
+  @parameterized.parameters(False, True)
+  def test_compose_many(self, symmetric):
+    log_pmf_lower1 = {1: math.log(0.2), 2: math.log(0.2), 3: math.log(0.6)}
+    log_pmf_upper1 = {1: math.log(0.5), 2: math.log(0.2), 4: math.log(0.3)}
+    pld1 = self._create_pld(log_pmf_lower1, log_pmf_upper1)
+    if symmetric:
+      pld1 = privacy_loss_distribution.PrivacyLossDistribution(pld1._pmf_remove)
+    pld2 = privacy_loss_distribution.from_laplace_mechanism(1.0)
+    pld3 = privacy_loss_distribution.from_randomized_response(0.5, 4)
+
+    result = pld1.compose_many([pld2, pld3, pld2])
+    expected_result = pld1.compose(pld2).compose(pld3).compose(pld2)
+
+    self.assertEqual(symmetric, result._symmetric)
+    for epsilon in (-0.5, 0, 0.5, 1, 2):
+      self.assertAlmostEqual(
+          expected_result.get_delta_for_epsilon(epsilon),
+          result.get_delta_for_epsilon(epsilon))
+
   def test_self_composition(self):
     log_pmf_lower = {1: math.log(0.2), 2: math.log(0.2), 3: math.log(0.6)}
     log_pmf_upper = {1: math.log(0.5), 2: math.log(0.2), 4: math.log(0.3)}
@@ -447,6 +468,27 @@ class AddRemovePrivacyLossDistributionTest(parameterized.TestCase):
         expected_result.get_delta_for_epsilon(-0.2),
         result.get_delta_for_epsilon(-0.2))
 
+  def test_weak_reference(self):
+    pld = privacy_loss_distribution.identity()
+    self.assertIs(pld, weakref.ref(pld)())
+
+  def test_coarsen(self):
+    log_pmf_lower = {1: math.log(0.2), 2: math.log(0.2), 3: math.log(0.6)}
+    log_pmf_upper = {1: math.log(0.5), 2: math.log(0.2), 4: math.log(0.3)}
+
+    pld = self._create_pld(log_pmf_lower, log_pmf_upper).self_compose(3)
+    result = pld.coarsen(4)
+
+    self.assertAlmostEqual(4 * pld._pmf_remove._discretization,
+                           result._pmf_remove._discretization)
+    self.assertAlmostEqual(4 * pld._pmf_add._discretization,
+                           result._pmf_add._discretization)
+    # Pessimistic rounding never decreases the hockey stick divergence.
+    for epsilon in (-0.5, 0, 0.3, 1):
+      self.assertGreaterEqual(
+          result.get_delta_for_epsilon(epsilon),
+          pld.get_delta_for_epsilon(epsilon) - 1e-12)
+
 
 class LaplacePrivacyLossDistributionTest(parameterized.TestCase):
 
@@ -1116,6 +1158,16 @@ class GaussianPrivacyLossDistributionTest(parameterized.TestCase):
         sampling_prob=0.1,
         use_connect_dots=False)
 
+  def test_gaussian_array_standard_deviation(self):
+    # Scalar arrays are accepted as parameters, as they are by the other
+    # factory methods.
+    pld = privacy_loss_distribution.from_gaussian_mechanism(
+        np.array(1.0), value_discretization_interval=1e-2)
+    expected_pld = privacy_loss_distribution.from_gaussian_mechanism(
+        1.0, value_discretization_interval=1e-2)
+    self.assertAlmostEqual(expected_pld.get_delta_for_epsilon(1.0),
+                           pld.get_delta_for_epsilon(1.0))
+
 
 class DiscreteLaplacePrivacyLossDistributionTest(parameterized.TestCase):
 
@@ -2264,6 +2316,17 @@ class RandomizedResponsePrivacyLossDistributionTest(parameterized.TestCase):
           self, pld, expected_rounded_pmf_add, 0.0, expected_rounded_pmf, 0.0
       )
 
+  def test_randomized_response_repeated_calls(self):
+    # Repeated calls reuse cached values, but must not share the pmfs.
+    pld1 = privacy_loss_distribution.from_randomized_response(0.5, 4)
+    pld2 = privacy_loss_distribution.from_randomized_response(0.5, 4)
+    # pylint: disable=protected-access
+    self.assertIsNot(pld1._pmf_remove, pld2._pmf_remove)
+    self.assertIsNot(pld1._pmf_remove._probs, pld2._pmf_remove._probs)
+    self.assertEqual(pld1._pmf_remove._loss_probs,
+                     pld2._pmf_remove._loss_probs)
+    # pylint: enable=protected-access
+
   @parameterized.parameters((0.0, 10), (1.1, 4), (0.5, 1))
   def test_randomized_response_value_errors(self, noise_parameter, num_buckets):
     with self.assertRaises(ValueError):
@@ -2271,6 +2334,50 @@ class RandomizedResponsePrivacyLossDistributionTest(parameterized.TestCase):
           noise_parameter, num_buckets)
 
 
+class PrivacyParametersPrivacyLossDistributionTest(parameterized.TestCase):
+
+  @parameterized.parameters((1e-4,), (0.3,))
+  def test_from_privacy_parameters_batch(self, value_discretization_interval):
+    privacy_parameters = [
+        common.DifferentialPrivacyParameters(epsilon, delta)
+        for epsilon, delta in ((1.0, 1e-5), (0.0, 0.1), (0.25, 0.0),
+                               (3.0, 1e-8))
+    ]
+
+    plds = privacy_loss_distribution.from_privacy_parameters_batch(
+        privacy_parameters, value_discretization_interval)
+
+    self.assertLen(plds, len(privacy_parameters))
+    for pld, parameters in zip(plds, privacy_parameters):
+      expected_pld = privacy_loss_distribution.from_privacy_parameters(
+          parameters, value_discretization_interval)
+      # pylint: disable=protected-access
+      _assert_pld_pmf_equal(self, pld,
+                            expected_pld._pmf_remove._loss_probs,
+                            expected_pld._pmf_remove._infinity_mass)
+      # pylint: enable=protected-access
+
+  def test_from_privacy_parameters_batch_empty(self):
+    self.assertEqual(
+        [], privacy_loss_distribution.from_privacy_parameters_batch([]))
+
+  @parameterized.parameters((math.inf, 0.1, 'epsilon should be finite'),
+                            (math.nan, 0.1, 'epsilon should be finite'),
+                            (1.0, 1.5, 'delta should be between 0 and 1'))
+  def test_from_privacy_parameters_value_errors(self, epsilon, delta,
+                                                error_message):
+    # The parameters are modified after construction, which bypasses the
+    # validation in DifferentialPrivacyParameters.
+    privacy_parameters = common.DifferentialPrivacyParameters(1.0, 0.0)
+    privacy_parameters.epsilon = epsilon
+    privacy_parameters.delta = delta
+    with self.assertRaisesRegex(ValueError, error_message):
+      privacy_loss_distribution.from_privacy_parameters(privacy_parameters)
+    with self.assertRaisesRegex(ValueError, error_message):
+      privacy_loss_distribution.from_privacy_parameters_batch(
+          [common.DifferentialPrivacyParameters(1.0, 0.1), privacy_parameters])
+
+
 class IdentityPrivacyLossDistributionTest(parameterized.TestCase):
 
   def test_identity(self):